@@ -0,0 +1 @@
+"""Gemeinsame Daten- und Analyse-Logik für die Streamlit-Seiten."""
@@ -0,0 +1,217 @@
+"""Abfrage-Schnittstelle ohne Streamlit (für Reporting-Jobs und ``analyse.server``).
+
+``Abfragen`` lädt den Datensatz einmal (Arrow-Cache), baut Würfel und
+Plattform-Matrix und beantwortet Fragen wie "Ø Depression je
+Nutzungskategorie für Studenten, 18-25" oder "Instagram vs. TikTok".
+Die Ergebnisse sind JSON-fähige Dicts und werden pro normalisierter Anfrage
+in einem thread-sicheren LRU-Cache gehalten; mehrere Threads dürfen
+gleichzeitig abfragen.
+
+    from analyse.abfrage import Abfragen
+    api = Abfragen()
+    api.mittelwerte("Depression", nach="nutzung", berufe=["Student (Uni)"], alter=(18, 25))
+"""
+import math
+import numbers
+
+from analyse import bootstrap, cube, daten, kohorten, korrelation, plattformen
+from analyse.diagramme import rename_map
+from analyse.filter import FilterState
+from analyse.lru import LRUCache
+from analyse.schema import AGE_BOUNDS, DEPRESSION_COL
+
+CACHE_BYTES = 64 * 1024 ** 2
+GRUPPIERUNGEN = ("nutzung", "beruf")
+
+
+def _zahl(wert):
+    # NaN ist kein gültiges JSON
+    wert = float(wert)
+    return None if math.isnan(wert) else wert
+
+
+def _auswahl(name, werte, erlaubt):
+    """Liste von Texten aus ``erlaubt`` als Tupel (fehlend/leer = ``()``)."""
+    if not werte:
+        return ()
+    if isinstance(werte, str) or not isinstance(werte, (list, tuple)) or not all(isinstance(w, str) for w in werte):
+        raise ValueError(f"'{name}' muss eine Liste von Texten sein")
+    unbekannt = [w for w in werte if w not in erlaubt]
+    if unbekannt:
+        raise ValueError(f"Unbekannte Werte für '{name}': {', '.join(unbekannt)}")
+    return tuple(werte)
+
+
+def _altersbereich(alter):
+    """``(von, bis)`` als ganze Zahlen innerhalb von ``AGE_BOUNDS`` (fehlend = ``None``)."""
+    if alter is None:
+        return None
+    if (not isinstance(alter, (list, tuple)) or len(alter) != 2
+            or not all(isinstance(a, numbers.Integral) and not isinstance(a, bool) for a in alter)):
+        raise ValueError("'alter' muss genau zwei ganze Zahlen (von, bis) enthalten")
+    von, bis = alter
+    if not AGE_BOUNDS[0] <= von <= bis <= AGE_BOUNDS[1]:
+        raise ValueError(f"'alter' muss {AGE_BOUNDS[0]} <= von <= bis <= {AGE_BOUNDS[1]} erfüllen")
+    return int(von), int(bis)
+
+
+def _tabelle(t):
+    # DataFrame -> verschachteltes Dict, NaN als null
+    return t.astype(object).where(t.notna(), None).to_dict(orient="index")
+
+
+class Abfragen:
+    """Abfragen auf dem bereinigten Datensatz (inklusive eingespielter Wellen)."""
+
+    def __init__(self, df=None, cache_bytes=CACHE_BYTES):
+        self.df = daten.load_data() if df is None else df
+        if self.df is None:
+            raise FileNotFoundError(daten.DATA_PATH)
+        self.cube = cube.AggregateCube(self.df)
+        self.matrix = plattformen.platform_matrix(self.df)
+        self.gruppen = kohorten.GruppenTabelle(self.df)
+        self.standard = FilterState.default(self.df)
+        self.cache = LRUCache(cache_bytes)
+        # Kurze deutsche Namen (wie in der Heatmap) oder volle Fragen-Texte
+        self._fragen = {name.lower(): col for col, name in rename_map.items() if col in self.cube.columns}
+        self._fragen.update({col.lower(): col for col in self.cube.columns})
+
+    # --- Parameter ---
+    def filter(self, berufe=None, zeiten=None, alter=None):
+        """``FilterState`` aus optionalen Parametern (fehlend = alles)."""
+        return FilterState(
+            _auswahl("berufe", berufe, self.standard.berufe) or self.standard.berufe,
+            _auswahl("zeiten", zeiten, self.standard.zeiten) or self.standard.zeiten,
+            _altersbereich(alter) or self.standard.alter,
+        )
+
+    def frage(self, name):
+        try:
+            return self._fragen[name.lower()]
+        except KeyError:
+            raise ValueError(f"Unbekannte Frage: {name}") from None
+
+    def _cached(self, name, key, compute):
+        return self.cache.get_or_compute((name, self.df.attrs.get("fingerprint"), key), compute)
+
+    # --- Abfragen ---
+    def mittelwerte(self, frage="Depression", nach=None, berufe=None, zeiten=None, alter=None):
+        """Mittelwert, Standardabweichung und Anzahl einer Frage, optional je Gruppe."""
+        col = self.frage(frage)
+        if nach is not None and nach not in GRUPPIERUNGEN:
+            raise ValueError(f"'nach' muss einer von {', '.join(GRUPPIERUNGEN)} sein")
+        state = self.filter(berufe, zeiten, alter)
+
+        def berechnen():
+            if nach == "nutzung":
+                gruppen = {z: self.cube.query(state.berufe, (z,), state.alter) for z in state.zeiten}
+            elif nach == "beruf":
+                gruppen = {b: self.cube.query((b,), state.zeiten, state.alter) for b in state.berufe}
+            else:
+                gruppen = {"gesamt": self.cube.query(state.berufe, state.zeiten, state.alter)}
+            k = self.cube.columns.index(col)
+            return {
+                "frage": col, "nach": nach, "filter": _filter_dict(state),
+                "gruppen": [{"gruppe": name, "n": int(e.counts[k]), "mittelwert": _zahl(e.mean(col)),
+                             "std": _zahl(e.std(col))} for name, e in gruppen.items()],
+            }
+        return self._cached("mittelwerte", (col, nach, state.key()), berechnen)
+
+    def statistik(self, berufe=None, zeiten=None, alter=None):
+        """``describe()`` für Alter und alle Likert-Fragen."""
+        state = self.filter(berufe, zeiten, alter)
+
+        def berechnen():
+            beschreibung = self.cube.query(state.berufe, state.zeiten, state.alter).describe()
+            return {"filter": _filter_dict(state),
+                    "statistik": {col: {k: _zahl(v) for k, v in werte.items()} for col, werte in beschreibung.items()}}
+        return self._cached("statistik", state.key(), berechnen)
+
+    def _plattform_daten(self, state):
+        positionen = state.positions(self.df)
+        return self.matrix.iloc[positionen], self.df[DEPRESSION_COL].iloc[positionen]
+
+    def battle(self, app1, app2, berufe=None, zeiten=None, alter=None):
+        """Ø Depression zweier Apps mit Bootstrap-KI und Permutationstest (nur App 1 vs. nur App 2)."""
+        for app in (app1, app2):
+            if app not in plattformen.APPS:
+                raise ValueError(f"Unbekannte App: {app}")
+        if app1 == app2:
+            raise ValueError("'app1' und 'app2' müssen verschiedene Apps sein")
+        state = self.filter(berufe, zeiten, alter)
+
+        def berechnen():
+            matrix, werte = self._plattform_daten(state)
+            y = werte.to_numpy(dtype=float)
+            apps = {}
+            for app in (app1, app2):
+                mittel, unten, oben, n = bootstrap.mean_ci(bootstrap.zaehlen(y[matrix[app].to_numpy()]))
+                apps[app] = {"n": int(n), "mittelwert": _zahl(mittel), "ki": [_zahl(unten), _zahl(oben)]}
+            # Test nur auf getrennten Gruppen (Nutzer beider Apps ausgenommen)
+            nur_1, nur_2 = (bootstrap.zaehlen(w) for w in plattformen.exklusiv(matrix, werte, app1, app2))
+            p = bootstrap.permutation_test(nur_1, nur_2)
+            return {"filter": _filter_dict(state), "apps": apps, "p": _zahl(p),
+                    "n_test": [int(nur_1.sum()), int(nur_2.sum())]}
+        return self._cached("battle", (app1, app2, state.key()), berechnen)
+
+    def app_paare(self, berufe=None, zeiten=None, alter=None):
+        """Alle 36 App-Paare (Nutzerzahlen, Mittelwerte, Überschneidung)."""
+        state = self.filter(berufe, zeiten, alter)
+
+        def berechnen():
+            paare = plattformen.all_pairs(*self._plattform_daten(state))
+            zeilen = paare.astype(object).where(paare.notna(), None).to_dict(orient="records")
+            return {"filter": _filter_dict(state), "paare": zeilen}
+        return self._cached("app_paare", state.key(), berechnen)
+
+    def korrelation(self, methode="pearson", berufe=None, zeiten=None, alter=None):
+        """Korrelationsmatrix der Likert-Fragen mit p-Werten."""
+        if methode not in korrelation.METHODEN:
+            raise ValueError(f"'methode' muss einer von {', '.join(korrelation.METHODEN)} sein")
+        state = self.filter(berufe, zeiten, alter)
+
+        def berechnen():
+            ergebnis = korrelation.korrelation(state.apply(self.df), methode).umbenannt(rename_map)
+            return {"filter": _filter_dict(state), "methode": methode,
+                    "r": _tabelle(ergebnis.r), "p": _tabelle(ergebnis.p), "n": _tabelle(ergebnis.n)}
+        return self._cached("korrelation", (methode, state.key()), berechnen)
+
+    def kohorte(self, angaben):
+        """``Kohorte`` aus einem Dict mit ``berufe``, ``zeiten``, ``alter``, ``apps``, ``alle_apps``."""
+        unbekannt = set(angaben) - {"berufe", "zeiten", "alter", "apps", "alle_apps"}
+        if unbekannt:
+            raise ValueError(f"Unbekannte Angabe(n) für eine Kohorte: {', '.join(sorted(unbekannt))}")
+        alle_apps = angaben.get("alle_apps", False)
+        if not isinstance(alle_apps, bool):
+            raise ValueError("'alle_apps' muss true oder false sein")
+        # Dieselben Prüfungen wie bei den Filtern
+        return kohorten.Kohorte(
+            _auswahl("berufe", angaben.get("berufe"), self.standard.berufe),
+            _auswahl("zeiten", angaben.get("zeiten"), self.standard.zeiten),
+            _altersbereich(angaben.get("alter")),
+            _auswahl("apps", angaben.get("apps"), plattformen.APPS),
+            alle_apps,
+        )
+
+    def kohorten_vergleich(self, a, b):
+        """Alle Likert-Fragen für zwei Kohorten (Dicts wie bei ``kohorte``)."""
+        a, b = self.kohorte(a or {}), self.kohorte(b or {})
+
+        def berechnen():
+            ergebnis = kohorten.vergleich(self.gruppen, a, b)
+            personen_a, personen_b = ergebnis.attrs["personen"]
+            zeilen = ergebnis.rename(index=rename_map).astype(object)
+            return {"personen": {"a": personen_a, "b": personen_b},
+                    "fragen": zeilen.where(zeilen.notna(), None).to_dict(orient="index")}
+        return self._cached("kohorten", (a.key(), b.key()), berechnen)
+
+    def kategorien(self):
+        """Gültige Werte für die Filter-Parameter."""
+        return {"berufe": list(self.standard.berufe), "zeiten": list(self.standard.zeiten),
+                "alter": list(self.standard.alter), "apps": list(plattformen.APPS),
+                "fragen": [rename_map.get(c, c) for c in self.cube.columns],
+                "methoden": list(korrelation.METHODEN)}
+
+
+def _filter_dict(state):
+    return {"berufe": list(state.berufe), "zeiten": list(state.zeiten), "alter": list(state.alter)}
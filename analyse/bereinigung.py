@@ -0,0 +1,239 @@
+"""Deklarative Bereinigungs-Regeln, kompiliert zu einem Durchlauf.
+
+Die Regeln stehen als Daten in ``REGELN``. ``Bereinigung`` sortiert sie in
+drei Gruppen und wendet sie in einem Durchlauf an:
+
+1. Zeilen-Filter (``NurWerte``, ``Bereich``, ``Wertebereich``) werden als
+   boolesche Masken auf den Rohspalten berechnet - bei Categoricals nur auf
+   den Kategorien - und zu einer Maske verknüpft. Einträge, die sich nicht als
+   Zahl lesen lassen (z.B. "n/a"), verletzen die Zahlen-Regeln.
+2. ``SpaltenBehalten`` legt fest, welche Spalten übernommen werden. Die
+   behaltenen Zeilen und Spalten werden genau einmal per ``take`` kopiert.
+3. Label-Regeln (``Zuordnung``, ``Einteilung``) arbeiten danach auf den
+   Kategorien und nicht pro Zeile.
+
+Der Bericht zählt pro Regel, wie viele Zeilen sie entfernt hat. Eine Zeile
+zählt bei der ersten Regel, an der sie scheitert, wie bei den früheren
+nacheinander ausgeführten Schritten. Regeln, deren Spalte im Export fehlt,
+werden als "nicht anwendbar" geführt.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analyse.schema import (AGE_BOUNDS, AGE_COL, LIKERT_COLS, LIKERT_VALUES, OCCUPATION_COL, PLATFORMS_COL, TIME_COL,
+                            USAGE_BUCKETS, USAGE_COL, USES_SOCIAL_MEDIA_COL, apply_schema, uebersetzung)
+
+BERICHT_SPALTEN = ["Regel", "Beschreibung", "Zeilen entfernt", "Details"]
+
+
+class SchemaFehler(ValueError):
+    """Der Export passt nicht zum erwarteten Schema."""
+
+
+def _treffer(spalte, werte):
+    """``spalte.isin(werte)``, bei Categoricals nur über die Kategorien."""
+    if isinstance(spalte.dtype, pd.CategoricalDtype):
+        erlaubt = np.append(spalte.cat.categories.isin(werte), False)
+        return erlaubt[spalte.cat.codes.to_numpy()]
+    return spalte.isin(werte).to_numpy()
+
+
+def _zahlen(werte):
+    """Zahlen als Float-Array und Maske der Einträge, die erst durch die Umwandlung fehlen (z.B. "n/a")."""
+    if isinstance(werte, pd.DataFrame):
+        zahlen = werte.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    else:
+        zahlen = pd.to_numeric(werte, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return zahlen, np.isnan(zahlen) & werte.notna().to_numpy()
+
+
+# --- ZEILEN-FILTER ---
+@dataclass(frozen=True)
+class NurWerte:
+    """Nur Zeilen behalten, deren Wert in ``werte`` liegt."""
+
+    name: str
+    spalte: str
+    werte: tuple
+    beschreibung: str = ""
+
+    def spalten(self):
+        return [self.spalte]
+
+    def maske(self, df):
+        return _treffer(df[self.spalte], self.werte)
+
+
+@dataclass(frozen=True)
+class Bereich:
+    """Zahlen außerhalb ``[unten, oben]`` und unlesbare Werte entfernen; fehlende Werte bleiben."""
+
+    name: str
+    spalte: str
+    unten: float
+    oben: float
+    beschreibung: str = ""
+
+    def spalten(self):
+        return [self.spalte]
+
+    def maske(self, df):
+        werte, unlesbar = _zahlen(df[self.spalte])
+        with np.errstate(invalid="ignore"):
+            return (np.isnan(werte) & ~unlesbar) | ((werte >= self.unten) & (werte <= self.oben))
+
+
+@dataclass(frozen=True)
+class Wertebereich:
+    """Zeilen entfernen, in denen eine der ``spalten_liste`` einen Wert außerhalb ``werte`` hat."""
+
+    name: str
+    spalten_liste: tuple
+    werte: tuple
+    beschreibung: str = ""
+
+    def spalten(self):
+        return list(self.spalten_liste)
+
+    def maske(self, df):
+        vorhanden = [c for c in self.spalten_liste if c in df.columns]
+        werte, unlesbar = _zahlen(df[vorhanden])
+        return ((np.isnan(werte) & ~unlesbar) | np.isin(werte, self.werte)).all(axis=1)
+
+
+# --- SPALTEN ---
+@dataclass(frozen=True)
+class SpaltenBehalten:
+    """Nur die Analyse-Spalten übernehmen (Reihenfolge wie im Export)."""
+
+    name: str
+    spalten_liste: tuple
+    beschreibung: str = ""
+
+
+# --- LABELS (auf den Kategorien) ---
+@dataclass(frozen=True)
+class Zuordnung:
+    """Kategorien umbenennen (z.B. Übersetzung)."""
+
+    name: str
+    spalte: str
+    abbildung: dict
+    beschreibung: str = ""
+
+    def spalten(self):
+        return [self.spalte]
+
+    def anwenden(self, df):
+        spalte = df[self.spalte]
+        betroffen = int(_treffer(spalte, list(self.abbildung)).sum())
+        df[self.spalte] = spalte.cat.rename_categories(lambda k: self.abbildung.get(k, k))
+        return betroffen, None
+
+
+@dataclass(frozen=True)
+class Einteilung:
+    """Neue Spalte ``ziel`` aus den Kategorien von ``quelle`` ableiten (Bucketing)."""
+
+    name: str
+    quelle: str
+    ziel: str
+    abbildung: dict
+    reihenfolge: tuple
+    beschreibung: str = ""
+
+    def spalten(self):
+        return [self.quelle]
+
+    def anwenden(self, df):
+        abgeleitet = df[self.quelle].map(self.abbildung)
+        neu = pd.Categorical(abgeleitet, categories=list(self.reihenfolge), ordered=True)
+        details = None
+        if self.ziel in df.columns:
+            # Vorhandene Spalte gegen die Regel prüfen (z.B. bereits vorab eingeteilte Exporte)
+            alt = df[self.ziel].astype(str).to_numpy()
+            abweichend = int((alt != np.asarray(neu.astype(str))).sum())
+            details = f"{abweichend} Abweichungen zur vorhandenen Spalte"
+        df[self.ziel] = neu
+        return int(pd.notna(neu).sum()), details
+
+
+REGELN = [
+    NurWerte("Inaktive Nutzer", USES_SOCIAL_MEDIA_COL, ("Yes",),
+             "Nur Personen, die Social Media nutzen"),
+    Bereich("Alters-Ausreißer", AGE_COL, *AGE_BOUNDS,
+            f"Alter außerhalb {AGE_BOUNDS[0]}-{AGE_BOUNDS[1]} ist unplausibel"),
+    Wertebereich("Ungültige Likert-Werte", tuple(LIKERT_COLS), LIKERT_VALUES,
+                 "Antworten der Fragen 9-20 müssen 1-5 sein"),
+    SpaltenBehalten("Feature Selection", (AGE_COL, OCCUPATION_COL, PLATFORMS_COL, TIME_COL, *LIKERT_COLS, USAGE_COL),
+                    "Spalten ohne Mehrwert für die Analyse entfernen"),
+    Zuordnung("Berufe übersetzen", OCCUPATION_COL, uebersetzung, "Berufsstatus auf Deutsch"),
+    Einteilung("Nutzungskategorie", TIME_COL, USAGE_COL, USAGE_BUCKETS, ("Wenig", "Mittel", "Viel"),
+               "Nutzungsdauer (Frage 8) in Wenig/Mittel/Viel einteilen"),
+]
+
+# Ohne diese Spalten ist der Export nicht auswertbar
+PFLICHT_SPALTEN = (AGE_COL, OCCUPATION_COL, PLATFORMS_COL, TIME_COL)
+
+
+class Bereinigung:
+    """Kompilierter Regelsatz: ``bereinigung(df)`` liefert (bereinigt, bericht)."""
+
+    def __init__(self, regeln=REGELN, pflicht=PFLICHT_SPALTEN):
+        self.regeln = list(regeln)
+        self.pflicht = tuple(pflicht)
+        self.filter = [r for r in self.regeln if hasattr(r, "maske")]
+        self.labels = [r for r in self.regeln if hasattr(r, "anwenden")]
+        behalten = [r for r in self.regeln if isinstance(r, SpaltenBehalten)]
+        self.behalten = behalten[0] if behalten else None
+
+    def validieren(self, df):
+        fehlend = [c for c in self.pflicht if c not in df.columns]
+        if fehlend:
+            raise SchemaFehler(f"Pflichtspalten fehlen: {', '.join(fehlend)}")
+
+    def __call__(self, df):
+        self.validieren(df)
+        bericht = {}
+
+        # 1. Alle Zeilen-Filter -> eine Maske (entfernt zählt bei der ersten verletzten Regel)
+        behalten = np.ones(len(df), dtype=bool)
+        for regel in self.filter:
+            if not any(c in df.columns for c in regel.spalten()):
+                bericht[regel.name] = (regel, 0, "nicht anwendbar (Spalte fehlt)")
+                continue
+            neu = behalten & regel.maske(df)
+            bericht[regel.name] = (regel, int(behalten.sum() - neu.sum()), None)
+            behalten = neu
+
+        # 2. Ein take für Zeilen und Spalten
+        spalten = list(df.columns)
+        if self.behalten is not None:
+            erlaubt = set(self.behalten.spalten_liste)
+            spalten = [c for c in df.columns if c in erlaubt]
+            entfernt = [c for c in df.columns if c not in erlaubt]
+            bericht[self.behalten.name] = (self.behalten, 0, f"{len(entfernt)} Spalten entfernt"
+                                           + (f": {', '.join(entfernt)}" if entfernt else ""))
+        ergebnis = df[spalten].take(np.flatnonzero(behalten))
+        try:
+            ergebnis = apply_schema(ergebnis.reset_index(drop=True))
+        except (ValueError, TypeError) as fehler:
+            # Werte, die keine Regel abfängt, sollen als Schema-Fehler ankommen (z.B. in ingest)
+            raise SchemaFehler(f"Schema nicht anwendbar: {fehler}") from fehler
+
+        # 3. Labels auf den Kategorien
+        for regel in self.labels:
+            if not all(c in ergebnis.columns for c in regel.spalten()):
+                bericht[regel.name] = (regel, 0, "nicht anwendbar (Spalte fehlt)")
+                continue
+            betroffen, details = regel.anwenden(ergebnis)
+            bericht[regel.name] = (regel, 0, f"{betroffen} Zeilen" + (f", {details}" if details else ""))
+
+        zeilen = [(name, regel.beschreibung, entfernt, details)
+                  for name, (regel, entfernt, details) in ((r.name, bericht[r.name]) for r in self.regeln)]
+        return ergebnis, pd.DataFrame(zeilen, columns=BERICHT_SPALTEN)
+
+
+bereinigen = Bereinigung()
@@ -0,0 +1,76 @@
+"""Bootstrap-Konfidenzintervalle und Permutationstests aus Häufigkeiten.
+
+Die Antworten sind Likert-Werte 1-5. Ein Bootstrap-Resample ist deshalb nur
+eine Multinomial-Ziehung der fünf Häufigkeiten, eine Permutation eine
+multivariat-hypergeometrische Aufteilung der gemeinsamen Häufigkeiten auf
+die beiden Gruppen. Alle ``B`` Ziehungen entstehen in einem NumPy-Aufruf
+(B × 5) und kosten unabhängig von der Zahl der Personen gleich viel. Die
+Häufigkeiten selbst liefert ``verteilung.haeufigkeiten`` (bzw. die gecachte
+``Verteilung``). Die Zufallszahlen kommen aus einem festen Seed, sodass die
+Ergebnisse pro Filter-Zustand reproduzierbar (und damit cachebar) sind.
+"""
+import numpy as np
+import pandas as pd
+
+from analyse.schema import LIKERT_VALUES
+from analyse.verteilung import haeufigkeiten
+
+BOOTSTRAP_B = 2000
+ALPHA = 0.05
+WERTE = np.asarray(LIKERT_VALUES, dtype=float)
+
+
+def zaehlen(werte):
+    """Häufigkeiten der Likert-Werte 1-5 in ``werte`` (fehlende und andere Werte fallen weg)."""
+    werte = np.asarray(werte, dtype=float)
+    return haeufigkeiten(np.zeros(len(werte), dtype=np.int64), werte[:, None], 1)[0, 0]
+
+
+def bootstrap_means(counts, b=BOOTSTRAP_B, seed=0):
+    """``b`` Bootstrap-Mittelwerte einer Gruppe mit den Häufigkeiten ``counts``."""
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    if n == 0:
+        return np.full(b, np.nan)
+    rng = np.random.default_rng(seed)
+    return rng.multinomial(n, counts / n, size=b) @ WERTE / n
+
+
+def mean_ci(counts, b=BOOTSTRAP_B, alpha=ALPHA, seed=0):
+    """Mittelwert mit Perzentil-Konfidenzintervall: (mittel, unten, oben, n)."""
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    if n == 0:
+        return np.nan, np.nan, np.nan, 0
+    unten, oben = np.quantile(bootstrap_means(counts, b, seed), [alpha / 2, 1 - alpha / 2])
+    return counts @ WERTE / n, unten, oben, n
+
+
+def permutation_test(counts_a, counts_b, b=BOOTSTRAP_B, seed=0):
+    """Zweiseitiger p-Wert für die Differenz der Mittelwerte zweier Gruppen.
+
+    Jede Permutation zieht ``n_a`` der gemeinsamen Antworten ohne Zurücklegen
+    für Gruppe A, der Rest bildet Gruppe B. Leere Gruppe -> ``nan``.
+    """
+    counts_a = np.asarray(counts_a, dtype=np.int64)
+    counts_b = np.asarray(counts_b, dtype=np.int64)
+    n_a, n_b = int(counts_a.sum()), int(counts_b.sum())
+    if n_a == 0 or n_b == 0:
+        return np.nan
+    gepoolt = counts_a + counts_b
+    beobachtet = abs(counts_b @ WERTE / n_b - counts_a @ WERTE / n_a)
+
+    rng = np.random.default_rng(seed)
+    summe_a = rng.multivariate_hypergeometric(gepoolt, n_a, size=b, method="marginals") @ WERTE
+    diff = (gepoolt @ WERTE - summe_a) / n_b - summe_a / n_a
+    extrem = int(np.count_nonzero(np.abs(diff) >= beobachtet - 1e-12))
+    return (extrem + 1) / (b + 1)
+
+
+def group_cis(verteilung, col, b=BOOTSTRAP_B, alpha=ALPHA, seed=0):
+    """Mittelwert und Konfidenzintervall von ``col`` je Gruppe einer ``Verteilung``."""
+    zeilen = {}
+    for gruppe, counts in zip(verteilung.gruppen, verteilung.counts_for(col)):
+        mittel, unten, oben, n = mean_ci(counts, b, alpha, seed)
+        zeilen[gruppe] = {"Ø": mittel, "KI unten": unten, "KI oben": oben, "n": n}
+    return pd.DataFrame.from_dict(zeilen, orient="index")
@@ -0,0 +1,185 @@
+"""Vorberechneter Aggregat-Würfel für die Sidebar-Filter.
+
+Der Würfel hat die Achsen Beruf × Nutzungskategorie × Alter. Jede Zelle hält
+die Anzahl der Personen und pro Likert-Frage Anzahl, Summe, Quadratsumme und
+die Häufigkeit jedes Antwortwerts 1-5. Entlang der Alters-Achse sind die Werte
+kumuliert, sodass jede Kombination aus Multiselects und Alters-Slider in
+O(Zellen) beantwortet wird - unabhängig von der Zahl der Befragten.
+"""
+import copy
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analyse.schema import (AGE_COL, DEPRESSION_COL, LIKERT_COLS, LIKERT_VALUES, OCCUPATION_COL, SLEEP_COL,
+                            USAGE_COL, WORRIES_COL)
+from analyse.statistik import describe_from_counts, std_from_sums
+from analyse.verteilung import haeufigkeiten
+
+# "Fokus: Mentale Gesundheit" auf der Explorations-Seite
+FOKUS_COLS = {DEPRESSION_COL: "Depression", WORRIES_COL: "Sorgen", SLEEP_COL: "Schlafprobleme"}
+
+
+@dataclass
+class CubeResult:
+    """Aggregierte Werte für eine Filter-Kombination."""
+
+    columns: list
+    rows: int
+    ages: np.ndarray
+    age_counts: np.ndarray  # Personen pro Alter
+    counts: np.ndarray      # (Fragen,) gültige Antworten
+    sums: np.ndarray        # (Fragen,)
+    sumsq: np.ndarray       # (Fragen,)
+    hist: np.ndarray        # (Fragen, 5) Häufigkeit der Werte 1-5
+
+    def mean(self, col=None):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = pd.Series(self.sums / self.counts, index=self.columns)
+        return means if col is None else means[col]
+
+    def std(self, col=None):
+        stds = pd.Series(std_from_sums(self.counts, self.sums, self.sumsq), index=self.columns)
+        return stds if col is None else stds[col]
+
+    def count_above(self, col, schwelle):
+        """Anzahl Antworten > ``schwelle`` für eine Frage."""
+        k = self.columns.index(col)
+        return int(self.hist[k][np.asarray(LIKERT_VALUES) > schwelle].sum())
+
+    def mean_age(self):
+        return float(self.age_counts @ self.ages / self.rows) if self.rows else float("nan")
+
+    def fokus(self):
+        """Mittelwerte der Fokus-Fragen mit kurzen deutschen Namen."""
+        cols = [c for c in FOKUS_COLS if c in self.columns]
+        stats = self.mean()[cols].to_frame(name="Ø Wert")
+        stats.index = [FOKUS_COLS[c] for c in cols]
+        return stats
+
+    def describe(self):
+        """Wie ``df.describe()`` für Alter und Likert-Fragen."""
+        stats = {AGE_COL: describe_from_counts(self.age_counts, self.ages)}
+        for k, col in enumerate(self.columns):
+            stats[col] = describe_from_counts(self.hist[k], LIKERT_VALUES)
+        return pd.DataFrame(stats)
+
+
+class AggregateCube:
+    """Beruf × Nutzungskategorie × Alter mit Präfixsummen entlang des Alters."""
+
+    def __init__(self, df, columns=None):
+        self.columns = [c for c in (columns or LIKERT_COLS) if c in df.columns]
+        self.occupations = list(df[OCCUPATION_COL].astype("category").cat.categories)
+        self.usages = list(df[USAGE_COL].astype("category").cat.categories)
+
+        codes = self._codes(df)
+        alter = codes[2]
+        self.min_age = int(alter.min()) if len(alter) else 0
+        self.max_age = int(alter.max()) if len(alter) else 0
+        self.ages = np.arange(self.min_age, self.max_age + 1)
+        self.count, self.hist = self._zaehlen(df, codes)
+        self._kumulieren()
+
+    def _codes(self, df):
+        """Achsen-Positionen (Beruf, Nutzung, Alter) der vollständigen Zeilen und deren Maske."""
+        o = df[OCCUPATION_COL].astype("category").cat.set_categories(self.occupations).cat.codes.to_numpy(dtype=np.int64)
+        u = df[USAGE_COL].astype("category").cat.set_categories(self.usages).cat.codes.to_numpy(dtype=np.int64)
+        alter = pd.to_numeric(df[AGE_COL], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        gueltig = (o >= 0) & (u >= 0) & ~np.isnan(alter)
+        return o[gueltig], u[gueltig], alter[gueltig].astype(np.int64), gueltig
+
+    def _zaehlen(self, df, codes):
+        o, u, alter, gueltig = codes
+        a = alter - self.min_age
+        n_o, n_u, n_a = len(self.occupations), len(self.usages), len(self.ages)
+        zelle = (o * n_u + u) * n_a + a
+
+        count = np.bincount(zelle, minlength=n_o * n_u * n_a).reshape(n_o, n_u, n_a)
+        werte = df.loc[gueltig, self.columns].to_numpy(dtype=float, na_value=np.nan)
+        hist = haeufigkeiten(zelle, werte, n_o * n_u * n_a)
+        return count, hist.reshape(n_o, n_u, n_a, *hist.shape[1:])
+
+    def _kumulieren(self):
+        v = np.asarray(LIKERT_VALUES, dtype=np.int64)
+        # Präfixsummen entlang des Alters, mit führender Null: P[a + 1] = Summe bis Alter a
+        self.cum_count = _prefix(self.count, axis=2)
+        self.cum_hist = _prefix(self.hist, axis=2)
+        self.cum_sums = _prefix(self.hist @ v, axis=2)
+        self.cum_sumsq = _prefix(self.hist @ v ** 2, axis=2)
+
+    def erweitert(self, df_neu):
+        """Neuer Würfel inklusive ``df_neu``; gezählt werden nur die neuen Zeilen.
+
+        Neue Kategorien oder Altersstufen vergrößern die Achsen, die bisherigen
+        Zählungen werden übernommen und nur die Präfixsummen neu gebildet.
+        """
+        neu = copy.copy(self)
+        neu.occupations = self.occupations + [k for k in df_neu[OCCUPATION_COL].astype("category").cat.categories
+                                              if k not in self.occupations]
+        neu.usages = self.usages + [k for k in df_neu[USAGE_COL].astype("category").cat.categories
+                                    if k not in self.usages]
+        codes = neu._codes(df_neu)
+        alter = codes[2]
+        if len(alter):
+            leer = not self.count.any()
+            neu.min_age = int(alter.min()) if leer else min(self.min_age, int(alter.min()))
+            neu.max_age = int(alter.max()) if leer else max(self.max_age, int(alter.max()))
+        neu.ages = np.arange(neu.min_age, neu.max_age + 1)
+
+        # Bisherige Zählungen an ihre Position im (evtl. größeren) Würfel legen
+        a0 = self.min_age - neu.min_age
+        ziel = np.s_[:len(self.occupations), :len(self.usages), a0:a0 + len(self.ages)]
+        count, hist = neu._zaehlen(df_neu, codes)
+        count[ziel] += self.count
+        hist[ziel] += self.hist
+        neu.count, neu.hist = count, hist
+        neu._kumulieren()
+        return neu
+
+    def _age_slice(self, age_range):
+        lo = max(int(age_range[0]), self.min_age) - self.min_age
+        hi = min(int(age_range[1]), self.max_age) - self.min_age
+        return lo, hi
+
+    def query(self, berufe=None, zeiten=None, age_range=None):
+        """Aggregierte Werte für die gewählten Berufe, Kategorien und Altersspanne."""
+        o = _indices(self.occupations, berufe)
+        u = _indices(self.usages, zeiten)
+        lo, hi = self._age_slice(age_range or (self.min_age, self.max_age))
+        if hi < lo or not len(o) or not len(u):
+            leer = np.zeros(len(self.columns))
+            return CubeResult(self.columns, 0, self.ages[:0], np.zeros(0), leer, leer, leer,
+                              np.zeros((len(self.columns), len(LIKERT_VALUES))))
+
+        def bereich(cum):
+            auswahl = cum[np.ix_(o, u)]
+            return (auswahl[:, :, hi + 1] - auswahl[:, :, lo]).sum(axis=(0, 1))
+
+        hist = bereich(self.cum_hist)
+        age_counts = self.count[np.ix_(o, u)][:, :, lo:hi + 1].sum(axis=(0, 1))
+        return CubeResult(
+            columns=self.columns,
+            rows=int(bereich(self.cum_count)),
+            ages=self.ages[lo:hi + 1],
+            age_counts=age_counts,
+            counts=hist.sum(axis=-1),
+            sums=bereich(self.cum_sums),
+            sumsq=bereich(self.cum_sumsq),
+            hist=hist,
+        )
+
+
+def _prefix(arr, axis):
+    kumuliert = np.cumsum(arr, axis=axis)
+    pad = [(0, 0)] * arr.ndim
+    pad[axis] = (1, 0)
+    return np.pad(kumuliert, pad)
+
+
+def _indices(kategorien, auswahl):
+    if auswahl is None:
+        return np.arange(len(kategorien))
+    auswahl = set(auswahl)
+    return np.array([i for i, k in enumerate(kategorien) if k in auswahl], dtype=np.int64)
@@ -0,0 +1,206 @@
+"""Zentrale Datenschicht: CSV laden, bereinigen und als Arrow-Datei cachen.
+
+Alle Seiten (``app.py`` und ``pages/``) holen ihre Daten von hier, damit die
+Bereinigung überall identisch ist. Das bereinigte Ergebnis wird als
+unkomprimierte Arrow-IPC-Datei (Feather v2) unter ``data/.cache`` abgelegt.
+Ein Kaltstart oder ein neuer Worker-Prozess liest dann nur noch diese Datei
+per Memory-Map, statt die CSV neu zu parsen und zu bereinigen.
+
+Spätere Umfrage-Wellen werden mit ``python -m analyse.ingest`` bereinigt und
+als eigene Partitionen unter ``data/wellen`` abgelegt (siehe ``wellen``);
+``load_data`` hängt sie an den Grunddatensatz an.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from analyse.bereinigung import bereinigen
+from analyse.schema import READ_DTYPES
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # Ohne pyarrow wird einfach jedes Mal die CSV gelesen
+    pa = None
+    feather = None
+
+# Kaputte oder halb geschriebene Cache-Datei: ArrowException kann auch erst in to_pandas() auftreten
+CACHE_FEHLER = (OSError, pa.ArrowException) if pa is not None else (OSError,)
+
+BASIS_DIR = Path(__file__).resolve().parent.parent
+DATA_PATH = BASIS_DIR / "data" / "social_media_cleaned.csv"
+CACHE_DIR = BASIS_DIR / "data" / ".cache"
+WELLEN_DIR = BASIS_DIR / "data" / "wellen"
+MANIFEST = "manifest.json"
+
+# Bei jeder Änderung an Bereinigung oder Schema hochzählen -> alte Cache-Dateien werden ignoriert
+CACHE_VERSION = 4
+
+
+def sha256(path):
+    """SHA-256 einer Datei, blockweise gelesen (``hashlib.file_digest`` gibt es erst ab Python 3.11)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path=DATA_PATH):
+    """Cache-Schlüssel aus Größe, mtime und Inhalts-Hash der CSV."""
+    stat = os.stat(path)
+    return f"v{CACHE_VERSION}-{stat.st_size}-{stat.st_mtime_ns}-{sha256(path)[:16]}"
+
+
+def clean(df):
+    """Bereinigungs-Logik (früher auf jeder Seite einzeln kopiert).
+
+    Die Schritte stehen als Regeln in ``analyse.bereinigung.REGELN``.
+    """
+    return bereinigen(df)[0]
+
+
+def cache_path(name, key, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{name}-{key}.arrow"
+
+
+def _read_cache(path):
+    # memory_map=True: Die Datei wird nicht kopiert, sondern direkt eingeblendet.
+    # split_blocks=True: Zahlen-Spalten ohne Lücken zeigen direkt in die gemappte Datei
+    # (read-only, Seiten-Cache wird von mehreren Worker-Prozessen geteilt)
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def write_arrow(df, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Erst in eine temporäre Datei schreiben, damit parallele Worker nie eine halbe Datei lesen
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def _write_cache(df, path):
+    write_arrow(df, path)
+    # Veraltete Versionen desselben Artefakts aufräumen
+    name = path.name.split("-", 1)[0]
+    for alt in path.parent.glob(f"{name}-*.arrow"):
+        if alt != path:
+            alt.unlink(missing_ok=True)
+
+
+def load_artifact(name, build, path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Abgeleiteten DataFrame ``build()`` mit demselben Schlüssel wie die CSV cachen.
+
+    So werden z.B. Qualitätsberichte nur einmal pro Datenstand berechnet und
+    liegen als Arrow-Datei neben dem bereinigten Datensatz.
+    """
+    key = fingerprint(path)
+    target = cache_path(name, key, cache_dir)
+    if feather is not None and target.exists():
+        try:
+            return _read_cache(target)
+        except CACHE_FEHLER:
+            pass
+
+    ergebnis = build()
+    if feather is not None:
+        try:
+            _write_cache(ergebnis, target)
+        except OSError:
+            pass
+    return ergebnis
+
+
+def cleaning_report(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Bericht der Bereinigung (eine Zeile pro Regel) für den Grunddatensatz."""
+    return load_artifact("bereinigung", lambda: bereinigen(read_raw(path))[1], path, cache_dir)
+
+
+def read_raw(path=DATA_PATH):
+    """CSV ohne Bereinigung (für Prüfungen auf dem Rohstand)."""
+    return pd.read_csv(path, dtype=READ_DTYPES)
+
+
+# --- UMFRAGE-WELLEN (Partitionen) ---
+def wellen(wellen_dir=WELLEN_DIR):
+    """Manifest-Einträge der eingespielten Wellen, älteste zuerst."""
+    try:
+        return json.loads((Path(wellen_dir) / MANIFEST).read_text(encoding="utf-8"))["wellen"]
+    except FileNotFoundError:
+        return []
+
+
+def welle_path(welle_id, wellen_dir=WELLEN_DIR):
+    return Path(wellen_dir) / f"welle-{welle_id:04d}.arrow"
+
+
+def read_welle(welle_id, wellen_dir=WELLEN_DIR):
+    """Bereinigte Zeilen einer Welle (per Memory-Map)."""
+    return _read_cache(welle_path(welle_id, wellen_dir))
+
+
+def anhaengen(df, teile, wellen_ids=()):
+    """Bereinigte Wellen an ``df`` hängen, ohne sie erneut zu bereinigen.
+
+    Die Kategorien werden vereinigt (bisherige Reihenfolge zuerst), damit die
+    Spalten Categoricals bleiben. Der Fingerprint bekommt die Wellen-IDs angehängt.
+    """
+    # Stand als (Welle, Zeilen)-Paare, damit abgeleitete Werte wissen, welche Zeilen neu sind
+    stand = tuple(df.attrs.get("wellen", ())) + tuple(zip(wellen_ids, map(len, teile)))
+    teile = [t for t in teile if len(t)]
+    if teile:
+        frames = [df, *teile]
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                kategorien = list(dict.fromkeys(k for f in frames for k in f[col].astype("category").cat.categories))
+                frames = [f.assign(**{col: f[col].astype("category").cat.set_categories(
+                    kategorien, ordered=df[col].cat.ordered)}) for f in frames]
+        neu = pd.concat(frames, ignore_index=True)
+    else:
+        neu = df.copy()
+    neu.attrs["fingerprint"] = df.attrs.get("fingerprint", "") + "".join(f"+w{i}" for i in wellen_ids)
+    neu.attrs["wellen"] = stand
+    return neu
+
+
+def load_data(path=DATA_PATH, cache_dir=CACHE_DIR, wellen_dir=WELLEN_DIR):
+    """Bereinigten Datensatz laden, bevorzugt aus dem Arrow-Cache.
+
+    Eingespielte Wellen aus ``wellen_dir`` werden angehängt (``None`` = nur
+    die CSV). Die Wellen gehören zum Grunddatensatz: Wer eine andere CSV lädt,
+    übergibt ``wellen_dir=None``. Gibt ``None`` zurück, wenn die CSV fehlt.
+    """
+    try:
+        key = fingerprint(path)
+    except FileNotFoundError:
+        return None
+
+    target = cache_path("daten", key, cache_dir)
+    df = None
+    if feather is not None and target.exists():
+        try:
+            df = _read_cache(target)
+        except CACHE_FEHLER:
+            pass  # Kaputte Cache-Datei -> neu aufbauen
+
+    if df is None:
+        df, protokoll = bereinigen(read_raw(path))
+        if feather is not None:
+            try:
+                _write_cache(df, target)
+                # Bericht fällt beim Bereinigen ohnehin an -> gleich mit ablegen
+                _write_cache(protokoll, cache_path("bereinigung", key, cache_dir))
+            except OSError:
+                pass  # z.B. schreibgeschütztes Dateisystem: dann eben ohne Cache
+
+    # Für Cache-Schlüssel, die vom Datensatz abhängen (z.B. gefilterte Ergebnisse)
+    df.attrs["fingerprint"] = key
+    if wellen_dir is not None and feather is not None:
+        ids = [e["id"] for e in wellen(wellen_dir)]
+        if ids:
+            df = anhaengen(df, [read_welle(i, wellen_dir) for i in ids], ids)
+    return df
@@ -0,0 +1,196 @@
+"""Diagramm-Funktionen der Visualisierungs-Seite.
+
+Jede Funktion gibt eine fertige Matplotlib-Figur zurück. Dadurch lassen sich
+die Diagramme cachen und auch ohne Streamlit-Server erzeugen. Box- und
+Balkendiagramme bekommen eine vorberechnete ``Verteilung`` (Häufigkeiten je
+Kategorie) statt der einzelnen Zeilen, die Korrelations-Heatmap ein fertiges
+``Korrelation``-Ergebnis (siehe ``analyse/korrelation.py``).
+
+Matplotlib und Seaborn werden erst beim ersten Zeichnen importiert, damit der
+Seitenstart nicht für Bibliotheken bezahlt, die evtl. gar nicht gebraucht werden.
+"""
+import numpy as np
+
+from analyse.korrelation import METHODEN
+from analyse.korrelation import korrelation as korrelation_likert
+from analyse.schema import DEPRESSION_COL, SLEEP_COL, WORRIES_COL
+
+# Konfiguration für Plots
+meine_farben = {"Wenig": "gold", "Mittel": "orange", "Viel": "red"}
+reihenfolge = ["Wenig", "Mittel", "Viel"]
+
+themen_dict = {
+    "Konzentrationsmangel": "14. Do you find it difficult to concentrate on things?",
+    "Ablenkung": "12. On a scale of 1 to 5, how easily distracted are you?",
+    "Validierung suchen": "17. How often do you look to seek validation from features of social media?",
+    "Interesse-Schwankung": "19. On a scale of 1 to 5, how frequently does your interest in daily activities fluctuate?"
+    # Schlafprobleme entfernt, da schon in Tab 2!
+}
+
+rename_map = {
+    '18. How often do you feel depressed or down?': 'Depression',
+    '13. On a scale of 1 to 5, how much are you bothered by worries?': 'Sorgen',
+    '20. On a scale of 1 to 5, how often do you face issues regarding sleep?': 'Schlaf',
+    '15. On a scale of 1-5, how often do you compare yourself to other successful people through the use of social media?': 'Vergleich',
+    '12. On a scale of 1 to 5, how easily distracted are you?': 'Ablenkung (Allgemein)',
+    '17. How often do you look to seek validation from features of social media?': 'Validierung',
+    '9. How often do you find yourself using Social media without a specific purpose?': 'Zwecklose Nutzung',
+    '10. How often do you get distracted by Social media when you are busy doing something?': 'Ablenkung (Arbeit)',
+    '11. Do you feel restless if you haven\'t used Social media in a while?': 'Unruhe',
+    '14. Do you find it difficult to concentrate on things?': 'Konzentration',
+    '19. On a scale of 1 to 5, how frequently does your interest in daily activities fluctuate?': 'Interesse-Schwankung',
+    '16. How do you feel about these comparisons, generally speaking?': 'Gefühl bei Vergleich'
+}
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _boxplot(ax, verteilung, col, farben, showmeans=False, meanprops=None):
+    """Boxplot aus vorberechneten Kennzahlen zeichnen (``Axes.bxp``)."""
+    stats = verteilung.box_stats(col)
+    positionen = [i for i, s in enumerate(stats) if s is not None]
+    boxen = ax.bxp(
+        [stats[i] for i in positionen], positions=positionen, patch_artist=True,
+        showmeans=showmeans, meanprops=meanprops, widths=0.6,
+        medianprops={"color": "0.25"}, flierprops={"marker": "d", "markerfacecolor": "0.25", "markersize": 5},
+    )
+    for box, i in zip(boxen["boxes"], positionen):
+        box.set_facecolor(farben[i])
+    ax.set_xticks(range(len(stats)), [str(g) for g in verteilung.gruppen])
+    ax.set_xlim(-0.5, len(stats) - 0.5)
+
+
+def _nutzungs_farben(verteilung):
+    return [meine_farben.get(g, "lightgray") for g in verteilung.gruppen]
+
+
+# A) Nutzungsdauer vs. Depression
+def depression_nach_nutzung(verteilung_nutzung):
+    plt = _pyplot()
+    fig1, ax1 = plt.subplots(figsize=(5, 5))
+    _boxplot(ax1, verteilung_nutzung, DEPRESSION_COL, _nutzungs_farben(verteilung_nutzung))
+    ax1.set_xlabel("Nutzungsdauer"); ax1.set_ylabel("Depression")
+    return fig1
+
+
+# B) Sozialer Vergleich vs. Depression
+def depression_nach_vergleich(verteilung_vergleich):
+    plt = _pyplot()
+    fig2, ax2 = plt.subplots(figsize=(5, 5))
+    blau = plt.get_cmap("Blues")(np.linspace(0.25, 0.85, len(verteilung_vergleich.gruppen)))
+    _boxplot(ax2, verteilung_vergleich, DEPRESSION_COL, blau)
+    ax2.set_xlabel("Vergleichshäufigkeit"); ax2.set_ylabel("Depression")
+    return fig2
+
+
+# C) Sorgen
+def sorgen_nach_nutzung(verteilung_nutzung, ki=None):
+    """Balken mit Mittelwerten; ``ki`` (aus ``bootstrap.group_cis``) ergänzt Konfidenzintervalle."""
+    plt = _pyplot()
+    fig3, ax3 = plt.subplots(figsize=(5, 5))
+
+    # Mittelwerte direkt aus den Häufigkeiten
+    mittel = verteilung_nutzung.means(WORRIES_COL)
+    fehler = None
+    if ki is not None:
+        ki = ki.reindex(mittel.index)
+        fehler = np.nan_to_num(np.vstack([mittel - ki["KI unten"], ki["KI oben"] - mittel]))
+    balken = ax3.bar(
+        [str(g) for g in mittel.index], mittel.fillna(0).to_numpy(),
+        color=_nutzungs_farben(verteilung_nutzung), width=0.8,
+        yerr=fehler, capsize=6, error_kw={"ecolor": "0.3", "elinewidth": 1}
+    )
+    ax3.bar_label(balken, labels=[f"{m:.2f}" if m == m else "" for m in mittel],
+                   # Mit Fehlerbalken steht die Zahl in der Mitte, sonst überlappt sie das KI
+                   label_type="center" if fehler is not None else "edge")
+
+    ax3.set_ylim(0, 5.5)
+    ax3.set_xlabel("Nutzungsdauer")
+    ax3.set_ylabel("Sorgen (1-5)")
+    return fig3
+
+
+# D) Schlafprobleme
+def schlaf_nach_nutzung(verteilung_nutzung):
+    plt = _pyplot()
+    fig4, ax4 = plt.subplots(figsize=(5, 5))
+
+    _boxplot(
+        ax4, verteilung_nutzung, SLEEP_COL, _nutzungs_farben(verteilung_nutzung),
+        # TRICK: Zeigt den Durchschnitt als weißen Diamanten an
+        showmeans=True,
+        meanprops={"marker": "D", "markerfacecolor": "white", "markeredgecolor": "black"}
+    )
+
+    # Achsen ordentlich beschriften
+    ax4.set_xlabel("Tägliche Nutzungsdauer")
+    ax4.set_ylabel("Häufigkeit Schlafprobleme (1-5)")
+    ax4.set_ylim(0, 5.5)
+    return fig4
+
+
+# Tab 4: Frei wählbares Thema vs. Nutzungsdauer
+def eigene_analyse(verteilung_nutzung, auswahl):
+    spalte_y = themen_dict[auswahl]
+    plt = _pyplot()
+    fig_custom, ax_custom = plt.subplots(figsize=(8, 5))
+    _boxplot(ax_custom, verteilung_nutzung, spalte_y, _nutzungs_farben(verteilung_nutzung))
+    ax_custom.set_title(f"Analyse: {auswahl} vs. Nutzungsdauer")
+    ax_custom.set_ylabel("Bewertung (1-5)")
+    ax_custom.set_xlabel("Tägliche Nutzungsdauer")
+    ax_custom.set_ylim(0.5, 5.5)
+    return fig_custom
+
+
+# Kohorten-Vergleich: Differenz B - A je Frage
+def kohorten_vergleich(ergebnis, alpha=0.05):
+    """Waagerechte Balken der Mittelwert-Differenzen mit 95%-Intervall (aus ``kohorten.vergleich``)."""
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    namen = [rename_map.get(c, c) for c in ergebnis.index]
+    differenz = ergebnis["Differenz"].to_numpy()
+    # Signifikante Unterschiede kräftig, der Rest blass
+    farben = ["tab:red" if d > 0 else "tab:blue" for d in np.nan_to_num(differenz)]
+    alphas = [1.0 if p < alpha else 0.35 for p in np.nan_to_num(ergebnis["p"].to_numpy(), nan=1.0)]
+    balken = ax.barh(namen, np.nan_to_num(differenz), xerr=np.nan_to_num(ergebnis["KI ±"].to_numpy()),
+                     color=farben, capsize=4, error_kw={"ecolor": "0.3", "elinewidth": 1})
+    for b, a in zip(balken, alphas):
+        b.set_alpha(a)
+
+    ax.axvline(0, color="0.3", linewidth=1)
+    ax.invert_yaxis()
+    ax.set_xlabel("Differenz der Mittelwerte (B - A)")
+    ax.set_title(f"Blass: p ≥ {alpha:g}", fontsize=10)
+    return fig
+
+
+def korrelationsmatrix(df_filtered, methode="pearson"):
+    # Likert-Fragen (ohne Alter) mit kurzen deutschen Namen
+    return korrelation_likert(df_filtered, methode).umbenannt(rename_map)
+
+
+# Tab 3: Korrelations-Heatmap
+def korrelation(ergebnis, nur_signifikant=False, alpha=0.05):
+    """Heatmap eines ``Korrelation``-Ergebnisses; nicht signifikante Felder bleiben optional leer."""
+    plt = _pyplot()
+    import seaborn as sns
+
+    maske = None
+    if nur_signifikant:
+        # NaN-p (zu wenige Fälle) gilt ebenfalls als nicht signifikant
+        maske = ~(ergebnis.p.to_numpy() < alpha)
+
+    # Heatmap etwas breiter machen
+    fig_corr, ax_corr = plt.subplots(figsize=(10, 6))
+    sns.heatmap(ergebnis.r, mask=maske, annot=True, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, ax=ax_corr)
+    titel = METHODEN[ergebnis.methode]
+    if nur_signifikant:
+        titel += f" (leer: p ≥ {alpha:g})"
+    ax_corr.set_title(titel)
+    return fig_corr
@@ -0,0 +1,153 @@
+"""Statische Berichte für jede Kombination aus Berufsgruppe × Nutzungskategorie.
+
+Aufruf (ohne Streamlit-Server)::
+
+    python -m analyse.export --out reports --workers 8
+
+Für jede Kombination entsteht ein Ordner mit allen Diagrammen der
+Visualisierungs-Seite (PNG), den Statistik-Tabellen der Explorations-Seite
+(CSV) und einer ``index.html``, die alles zusammenfasst. Gerendert wird in
+einem Prozess-Pool, weil Matplotlib nicht thread-sicher ist; jeder Worker
+lädt den Datensatz einmal (Arrow-Cache) und baut Würfel und Plattform-Matrix.
+"""
+import argparse
+import html
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from analyse import bootstrap, cube, daten, diagramme, plattformen, qualitaet, render, verteilung
+from analyse.filter import FilterState
+from analyse.schema import COMPARISON_COL, DEPRESSION_COL, USAGE_COL, WORRIES_COL
+
+# Pro Worker-Prozess einmal befüllt (siehe _init_worker)
+_worker = {}
+
+
+def _init_worker(csv_path, wellen_dir):
+    df = daten.load_data(csv_path, wellen_dir=wellen_dir)
+    _worker["df"] = df
+    _worker["cube"] = cube.AggregateCube(df)
+    _worker["matrix"] = plattformen.platform_matrix(df)
+
+
+def _slug(text):
+    ascii_text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9]+", "_", ascii_text).strip("_") or "leer"
+
+
+def kombinationen(df):
+    """Alle Filter-Zustände Beruf × Nutzungskategorie (volle Altersspanne)."""
+    standard = FilterState.default(df)
+    return [FilterState((beruf,), (zeit,), standard.alter) for beruf in standard.berufe for zeit in standard.zeiten]
+
+
+def _diagramme(df_filtered):
+    """(Dateiname, Zeichenfunktion, Argumente) - dieselben Diagramme wie auf Seite 2."""
+    vt_nutzung = verteilung.likert_counts(df_filtered, USAGE_COL)
+    vt_vergleich = verteilung.likert_counts(df_filtered, COMPARISON_COL)
+    eintraege = [
+        ("fig1_depression_nutzung", diagramme.depression_nach_nutzung, (vt_nutzung,)),
+        ("fig2_depression_vergleich", diagramme.depression_nach_vergleich, (vt_vergleich,)),
+        ("fig3_sorgen", diagramme.sorgen_nach_nutzung,
+         (vt_nutzung, bootstrap.group_cis(vt_nutzung, WORRIES_COL))),
+        ("fig4_schlaf", diagramme.schlaf_nach_nutzung, (vt_nutzung,)),
+    ]
+    for thema in diagramme.themen_dict:
+        eintraege.append((f"thema_{_slug(thema)}", diagramme.eigene_analyse, (vt_nutzung, thema)))
+    if len(df_filtered) > 1:
+        eintraege.append(("korrelation", diagramme.korrelation, (diagramme.korrelationsmatrix(df_filtered),)))
+    return eintraege
+
+
+def bericht(state, out_dir):
+    """Einen Bericht für ``state`` schreiben (läuft im Worker-Prozess)."""
+    df, wuerfel, matrix = _worker["df"], _worker["cube"], _worker["matrix"]
+    beruf, zeit = state.berufe[0], state.zeiten[0]
+    ziel = Path(out_dir) / f"{_slug(beruf)}__{_slug(zeit)}"
+    ziel.mkdir(parents=True, exist_ok=True)
+
+    df_filtered = state.apply(df)
+    auswertung = wuerfel.query(state.berufe, state.zeiten, state.alter)
+    if auswertung.rows == 0:
+        return {"Beruf": beruf, "Nutzungsdauer": zeit, "Zeilen": 0, "Ordner": ziel.name}
+
+    # --- STATISTIKEN (wie Seite 1) ---
+    tabellen = {
+        "describe": auswertung.describe(),
+        "fokus": auswertung.fokus(),
+        "plattformen_paare": plattformen.all_pairs(matrix.loc[df_filtered.index], df_filtered[DEPRESSION_COL]),
+    }
+    missing, dupes = qualitaet.basis_check(df_filtered)
+    tabellen["qualitaet"] = pd.DataFrame({"Wert": [auswertung.rows, missing, dupes]},
+                                         index=["Zeilen", "Fehlende Werte", "Duplikate"])
+    for name, tabelle in tabellen.items():
+        tabelle.to_csv(ziel / f"{name}.csv", index=name != "plattformen_paare")
+
+    # --- DIAGRAMME (wie Seite 2) ---
+    bilder = []
+    for name, draw, args in _diagramme(df_filtered):
+        (ziel / f"{name}.png").write_bytes(render.render_png(draw, *args))
+        bilder.append(f"{name}.png")
+
+    titel = f"{beruf} × {zeit}"
+    teile = [f"<h1>{html.escape(titel)}</h1>", f"<p>{auswertung.rows} Teilnehmer</p>"]
+    for name, tabelle in tabellen.items():
+        teile.append(f"<h2>{html.escape(name)}</h2>" + tabelle.to_html(float_format="%.2f", border=0))
+    teile.extend(f'<img src="{b}" style="max-width:48%">' for b in bilder)
+    (ziel / "index.html").write_text(_html(titel, teile), encoding="utf-8")
+    return {"Beruf": beruf, "Nutzungsdauer": zeit, "Zeilen": auswertung.rows, "Ordner": ziel.name}
+
+
+def _html(titel, teile):
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>{html.escape(titel)}</title></head>"
+            f"<body style='font-family:sans-serif'>{''.join(teile)}</body></html>")
+
+
+def export(out_dir, workers=None, csv_path=daten.DATA_PATH):
+    out_dir = Path(out_dir)
+    # Eingespielte Wellen gehören zum Grunddatensatz, nicht zu einer per --csv übergebenen Datei
+    wellen_dir = daten.WELLEN_DIR if Path(csv_path).resolve() == daten.DATA_PATH else None
+    df = daten.load_data(csv_path, wellen_dir=wellen_dir)  # baut ggf. den Arrow-Cache, den die Worker dann nur noch einblenden
+    if df is None:
+        raise SystemExit(f"Datei nicht gefunden: {csv_path}")
+
+    zustaende = kombinationen(df)
+    ergebnisse = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(csv_path, wellen_dir)) as pool:
+        futures = [pool.submit(bericht, state, out_dir) for state in zustaende]
+        for future in as_completed(futures):
+            zeile = future.result()
+            print(f"  {zeile['Beruf']} × {zeile['Nutzungsdauer']}: {zeile['Zeilen']} Zeilen", flush=True)
+            ergebnisse.append(zeile)
+
+    uebersicht = pd.DataFrame(ergebnisse).sort_values(["Beruf", "Nutzungsdauer"])
+    uebersicht.to_csv(out_dir / "uebersicht.csv", index=False)
+    links = "".join(
+        f"<li><a href='{html.escape(z.Ordner)}/index.html'>{html.escape(f'{z.Beruf} × {z.Nutzungsdauer}')}</a>"
+        f" ({z.Zeilen})</li>"
+        for z in uebersicht.itertuples() if z.Zeilen
+    )
+    (out_dir / "index.html").write_text(_html("Berichte", [f"<h1>Berichte</h1><ul>{links}</ul>"]), encoding="utf-8")
+    return uebersicht
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Berichte für alle Beruf × Nutzungsdauer-Kombinationen")
+    parser.add_argument("--out", type=Path, default=Path("reports"), help="Zielordner")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Anzahl Prozesse")
+    parser.add_argument("--csv", type=Path, default=daten.DATA_PATH, help="Quelldatei")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    uebersicht = export(args.out, workers=args.workers, csv_path=args.csv)
+    print(f"{len(uebersicht)} Berichte in {time.perf_counter() - start:.1f} s nach {args.out} geschrieben")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Gemeinsamer Filter-Zustand für beide Seiten.
+
+``FilterState`` beschreibt die Sidebar-Auswahl (Berufe, Nutzungsdauer, Alter).
+Über ``key()`` wird daraus ein normalisiertes Tupel, das als Cache-Schlüssel
+für gefilterte Daten und abgeleitete Statistiken dient.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from analyse.schema import AGE_COL, OCCUPATION_COL, USAGE_COL, categories
+
+
+@dataclass(frozen=True)
+class FilterState:
+    berufe: tuple
+    zeiten: tuple
+    alter: tuple
+
+    @classmethod
+    def default(cls, df):
+        """Alles ausgewählt, volle Altersspanne."""
+        return cls(
+            berufe=tuple(categories(df[OCCUPATION_COL])),
+            zeiten=tuple(categories(df[USAGE_COL])),
+            alter=(int(df[AGE_COL].min()), int(df[AGE_COL].max())),
+        )
+
+    def key(self):
+        # Reihenfolge der Auswahl spielt keine Rolle -> sortieren
+        return (tuple(sorted(self.berufe)), tuple(sorted(self.zeiten)), (int(self.alter[0]), int(self.alter[1])))
+
+    def mask(self, df):
+        """Boolesche Maske der Zeilen, die zum Filter passen."""
+        alter = df[AGE_COL].to_numpy()
+        return (
+            df[OCCUPATION_COL].isin(self.berufe).to_numpy()
+            & df[USAGE_COL].isin(self.zeiten).to_numpy()
+            & (alter >= self.alter[0])
+            & (alter <= self.alter[1])
+        )
+
+    def positions(self, df):
+        """Zeilenpositionen der Auswahl (statt einer gefilterten Kopie)."""
+        return np.flatnonzero(self.mask(df))
+
+    def apply(self, df):
+        return df[self.mask(df)]
+
+    def restrict(self, df):
+        """Zustand auf die im Datensatz vorhandenen Werte beschränken."""
+        standard = FilterState.default(df)
+        lo = min(max(self.alter[0], standard.alter[0]), standard.alter[1])
+        hi = max(min(self.alter[1], standard.alter[1]), lo)
+        return FilterState(
+            berufe=tuple(b for b in self.berufe if b in standard.berufe),
+            zeiten=tuple(z for z in self.zeiten if z in standard.zeiten),
+            alter=(lo, hi),
+        )
@@ -0,0 +1,96 @@
+"""Neue Umfrage-Wellen in den partitionierten Datensatz einspielen.
+
+Aufruf::
+
+    python -m analyse.ingest data/export_2025-03.csv [weitere.csv ...]
+
+Jede CSV wird einmal mit den Regeln aus ``analyse.bereinigung`` bereinigt
+(nur "Yes", Alters-Outlier, Übersetzung der Berufe, Einteilung in
+Wenig/Mittel/Viel) und als eigene Arrow-Partition
+``data/wellen/welle-NNNN.arrow`` abgelegt. Das Manifest ``manifest.json``
+listet die Partitionen samt entfernten Zeilen pro Regel; bereits eingespielte Dateien (gleicher Inhalts-Hash)
+werden übersprungen. Die App erkennt neue Einträge beim nächsten Rerun und
+hängt nur diese an Datensatz, Würfel und Plattform-Matrix an.
+"""
+import argparse
+import datetime
+import json
+import os
+from pathlib import Path
+
+from analyse import daten
+from analyse.bereinigung import SchemaFehler, bereinigen
+
+
+def _manifest_schreiben(eintraege, wellen_dir):
+    ziel = Path(wellen_dir) / daten.MANIFEST
+    tmp = ziel.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"wellen": eintraege}, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ziel)
+
+
+def ingest(csv_paths, wellen_dir=daten.WELLEN_DIR, basis_path=daten.DATA_PATH, cache_dir=daten.CACHE_DIR):
+    """CSV-Dateien als neue Wellen ablegen; gibt die neuen Manifest-Einträge zurück.
+
+    ``cache_dir`` nimmt den Arrow-Cache des Grunddatensatzes auf (für die Spaltenliste).
+    """
+    if daten.feather is None:
+        raise SystemExit("pyarrow wird für den partitionierten Datensatz benötigt")
+    basis = daten.load_data(basis_path, cache_dir=cache_dir, wellen_dir=None)
+    if basis is None:
+        raise SystemExit(f"Datei nicht gefunden: {basis_path}")
+    spalten = list(basis.columns)
+
+    eintraege = daten.wellen(wellen_dir)
+    bekannt = {e["sha256"] for e in eintraege}
+    neu = []
+    for csv_path in map(Path, csv_paths):
+        digest = daten.sha256(csv_path)
+        if digest in bekannt:
+            print(f"  {csv_path.name}: schon eingespielt, übersprungen")
+            continue
+
+        roh = daten.read_raw(csv_path)
+        try:
+            df, protokoll = bereinigen(roh)
+        except SchemaFehler as e:
+            raise SystemExit(f"{csv_path.name}: {e}")
+        fehlend = [c for c in spalten if c not in df.columns]
+        if fehlend:
+            raise SystemExit(f"{csv_path.name}: Spalten fehlen: {', '.join(fehlend)}")
+
+        welle_id = max((e["id"] for e in eintraege), default=0) + 1
+        # Nur die Spalten des Grunddatensatzes, in derselben Reihenfolge
+        daten.write_arrow(df[spalten], daten.welle_path(welle_id, wellen_dir))
+        eintrag = {
+            "id": welle_id,
+            "quelle": csv_path.name,
+            "sha256": digest,
+            "roh_zeilen": len(roh),
+            "zeilen": len(df),
+            "bereinigung": {r: int(n) for r, n in zip(protokoll["Regel"], protokoll["Zeilen entfernt"]) if n},
+            "eingespielt": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        eintraege.append(eintrag)
+        bekannt.add(digest)
+        # Manifest nach jeder Welle schreiben: erst dann ist die Partition sichtbar
+        _manifest_schreiben(eintraege, wellen_dir)
+        neu.append(eintrag)
+        print(f"  {csv_path.name}: Welle {welle_id}, {len(df)} von {len(roh)} Zeilen übernommen")
+    return neu
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Neue Umfrage-Wellen einspielen")
+    parser.add_argument("csv", type=Path, nargs="+", help="Export(e) der Umfrage")
+    parser.add_argument("--wellen", type=Path, default=daten.WELLEN_DIR, help="Zielordner der Partitionen")
+    parser.add_argument("--basis", type=Path, default=daten.DATA_PATH, help="Grunddatensatz (CSV)")
+    parser.add_argument("--cache", type=Path, default=daten.CACHE_DIR, help="Cache-Ordner für den Grunddatensatz")
+    args = parser.parse_args(argv)
+
+    neu = ingest(args.csv, wellen_dir=args.wellen, basis_path=args.basis, cache_dir=args.cache)
+    print(f"{len(neu)} neue Welle(n) in {args.wellen}")
+
+
+if __name__ == "__main__":
+    main()
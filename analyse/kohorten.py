@@ -0,0 +1,154 @@
+"""Vergleich zweier frei definierter Kohorten über alle Likert-Fragen.
+
+Eine Kohorte ist eine Kombination aus Berufen, Nutzungskategorien,
+Altersspanne und Plattformen. Statt pro Frage zweimal über die Zeilen zu
+maskieren, wird einmal eine dünn besetzte Tabelle mit den suffizienten
+Statistiken aufgebaut: eine Zelle je tatsächlich vorkommender Kombination
+(Beruf, Nutzung, Alter, Plattform-Liste) mit Anzahl und Häufigkeiten der
+Werte 1-5 je Frage. Eine Kohorte ist dann eine Maske über die Zellen; Anzahl,
+Summe und Quadratsumme ergeben sich aus der Summe der ausgewählten Zellen.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analyse import plattformen
+from analyse.bootstrap import ALPHA
+from analyse.schema import AGE_COL, LIKERT_COLS, LIKERT_VALUES, OCCUPATION_COL, PLATFORMS_COL, USAGE_COL
+from analyse.statistik import std_from_sums, t_quantil, t_sf
+from analyse.verteilung import haeufigkeiten
+
+
+@dataclass(frozen=True)
+class Kohorte:
+    """Leere Auswahl = keine Einschränkung; ``alle_apps``: alle statt mindestens eine App."""
+
+    berufe: tuple = ()
+    zeiten: tuple = ()
+    alter: tuple = None
+    apps: tuple = ()
+    alle_apps: bool = False
+
+    def key(self):
+        alter = None if self.alter is None else (int(self.alter[0]), int(self.alter[1]))
+        return (tuple(sorted(self.berufe)), tuple(sorted(self.zeiten)), alter, tuple(sorted(self.apps)),
+                bool(self.alle_apps and self.apps))
+
+
+class GruppenTabelle:
+    """Anzahl und Werte-Häufigkeiten je vorkommender (Beruf, Nutzung, Alter, Plattform-Liste)."""
+
+    def __init__(self, df, columns=None):
+        self.columns = [c for c in (columns or LIKERT_COLS) if c in df.columns]
+        self.berufe = list(df[OCCUPATION_COL].astype("category").cat.categories)
+        self.zeiten = list(df[USAGE_COL].astype("category").cat.categories)
+        self.plattform_listen = list(df[PLATFORMS_COL].astype("category").cat.categories)
+        self._zellen_setzen(*self._zaehlen(df))
+
+    def _zaehlen(self, df):
+        """Zellen-Schlüssel, Anzahl und Werte-Häufigkeiten der Zeilen von ``df``."""
+        o = df[OCCUPATION_COL].astype("category").cat.set_categories(self.berufe).cat.codes.to_numpy(dtype=np.int64)
+        u = df[USAGE_COL].astype("category").cat.set_categories(self.zeiten).cat.codes.to_numpy(dtype=np.int64)
+        # Fehlende Plattform-Angabe = eigene Zelle ohne Apps (Code -1 -> 0)
+        plattform = df[PLATFORMS_COL].astype("category").cat.set_categories(self.plattform_listen)
+        p = plattform.cat.codes.to_numpy(dtype=np.int64) + 1
+        alter = pd.to_numeric(df[AGE_COL], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        gueltig = (o >= 0) & (u >= 0) & ~np.isnan(alter)
+        zeilen = np.stack([o, u, np.nan_to_num(alter).astype(np.int64), p], axis=1)[gueltig]
+
+        zellen, zelle = _eindeutig(zeilen)
+        anzahl = np.bincount(zelle, minlength=len(zellen))
+        werte = df.loc[gueltig, self.columns].to_numpy(dtype=float, na_value=np.nan)
+        return zellen, anzahl, haeufigkeiten(zelle, werte, len(zellen))
+
+    def _zellen_setzen(self, schluessel, anzahl, hist):
+        # Gleiche Schlüssel zusammenfassen (nötig, wenn alte und neue Zellen kombiniert werden)
+        zellen, zelle = _eindeutig(schluessel)
+        self.beruf, self.nutzung, self.alter, self.plattform = zellen.T
+        self.anzahl = np.bincount(zelle, weights=anzahl, minlength=len(zellen)).astype(np.int64)
+        self.hist = np.zeros((len(zellen),) + hist.shape[1:], dtype=np.int64)
+        np.add.at(self.hist, zelle, hist)
+
+        # Apps je Plattform-Liste (Zeile 0 = keine Angabe)
+        listen = pd.DataFrame({PLATFORMS_COL: pd.Categorical(self.plattform_listen, categories=self.plattform_listen)})
+        apps = plattformen.platform_matrix(listen).to_numpy()
+        self.app_matrix = np.vstack([np.zeros((1, apps.shape[1]), dtype=bool), apps])
+
+    def erweitert(self, df_neu):
+        """Neue Tabelle inklusive ``df_neu``; ausgezählt werden nur die neuen Zeilen."""
+        neu = GruppenTabelle.__new__(GruppenTabelle)
+        neu.columns = self.columns
+        neu.berufe = _vereinigt(self.berufe, df_neu[OCCUPATION_COL])
+        neu.zeiten = _vereinigt(self.zeiten, df_neu[USAGE_COL])
+        neu.plattform_listen = _vereinigt(self.plattform_listen, df_neu[PLATFORMS_COL])
+        # Bisherige Codes bleiben gültig, weil neue Kategorien nur hinten angehängt werden
+        alt = np.stack([self.beruf, self.nutzung, self.alter, self.plattform], axis=1)
+        schluessel, anzahl, hist = neu._zaehlen(df_neu)
+        neu._zellen_setzen(np.vstack([alt, schluessel]), np.concatenate([self.anzahl, anzahl]),
+                           np.concatenate([self.hist, hist]))
+        return neu
+
+    def maske(self, kohorte):
+        """Boolesche Maske der Zellen, die zu ``kohorte`` gehören."""
+        maske = np.ones(len(self.anzahl), dtype=bool)
+        if kohorte.berufe:
+            maske &= np.isin(self.beruf, [i for i, b in enumerate(self.berufe) if b in set(kohorte.berufe)])
+        if kohorte.zeiten:
+            maske &= np.isin(self.nutzung, [i for i, z in enumerate(self.zeiten) if z in set(kohorte.zeiten)])
+        if kohorte.alter is not None:
+            maske &= (self.alter >= kohorte.alter[0]) & (self.alter <= kohorte.alter[1])
+        if kohorte.apps:
+            spalten = [plattformen.APPS.index(app) for app in kohorte.apps]
+            nutzt = self.app_matrix[:, spalten]
+            maske &= (nutzt.all(axis=1) if kohorte.alle_apps else nutzt.any(axis=1))[self.plattform]
+        return maske
+
+    def statistik(self, kohorte):
+        """(Personen, Anzahl, Summe, Quadratsumme je Frage) für eine Kohorte."""
+        maske = self.maske(kohorte)
+        hist = self.hist[maske].sum(axis=0)
+        v = np.asarray(LIKERT_VALUES, dtype=float)
+        return int(self.anzahl[maske].sum()), hist.sum(axis=1), hist @ v, hist @ v ** 2
+
+
+def _eindeutig(schluessel):
+    """Wie ``np.unique(axis=0, return_inverse=True)``, aber über einen int64-Schlüssel pro Zeile (viel schneller)."""
+    if not len(schluessel):
+        return np.zeros((0, 4), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    dims = tuple(int(d) for d in schluessel.max(axis=0) + 1)
+    flach, zelle = np.unique(np.ravel_multi_index(tuple(schluessel.T), dims), return_inverse=True)
+    return np.stack(np.unravel_index(flach, dims), axis=1), zelle.reshape(-1)
+
+
+def _vereinigt(bisher, spalte):
+    return bisher + [k for k in spalte.astype("category").cat.categories if k not in bisher]
+
+
+def vergleich(tabelle, a, b, alpha=ALPHA):
+    """Alle Likert-Fragen für Kohorte A und B: Mittelwerte, Differenz B - A, Cohen's d, p.
+
+    Intervall und p-Wert nach Welch mit t-Verteilung (Welch-Satterthwaite-Freiheitsgrade),
+    damit kleine Kohorten keine zu schmalen Intervalle bekommen.
+    """
+    personen_a, n_a, s_a, q_a = tabelle.statistik(a)
+    personen_b, n_b, s_b, q_b = tabelle.statistik(b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mittel_a, mittel_b = s_a / n_a, s_b / n_b
+        sd_a, sd_b = std_from_sums(n_a, s_a, q_a), std_from_sums(n_b, s_b, q_b)
+        differenz = mittel_b - mittel_a
+        var_a, var_b = sd_a ** 2 / n_a, sd_b ** 2 / n_b
+        fehler = np.sqrt(var_a + var_b)
+        freiheitsgrade = (var_a + var_b) ** 2 / (var_a ** 2 / (n_a - 1) + var_b ** 2 / (n_b - 1))
+        gepoolt = np.sqrt(((n_a - 1) * sd_a ** 2 + (n_b - 1) * sd_b ** 2) / (n_a + n_b - 2))
+        d = differenz / gepoolt
+        t = np.abs(differenz) / fehler
+    p = np.array([2 * t_sf(x, f) for x, f in zip(t, freiheitsgrade)])
+    quantil = np.array([t_quantil(1 - alpha / 2, f) for f in freiheitsgrade])
+    ergebnis = pd.DataFrame({
+        "n A": n_a.astype(np.int64), "Ø A": mittel_a, "SD A": sd_a,
+        "n B": n_b.astype(np.int64), "Ø B": mittel_b, "SD B": sd_b,
+        "Differenz": differenz, "KI ±": quantil * fehler, "Cohen's d": d, "p": p,
+    }, index=tabelle.columns)
+    ergebnis.attrs["personen"] = (personen_a, personen_b)
+    return ergebnis
@@ -0,0 +1,132 @@
+"""Korrelationen der Likert-Fragen aus 5×5-Kontingenztafeln.
+
+Alle Fragen haben nur die Werte 1-5. Pearson, Spearman (Mittelränge) und
+Kendall τ-b lassen sich deshalb exakt aus der Kreuztabelle jedes
+Fragen-Paares berechnen. Die Tafeln aller Paare entstehen in einem einzigen
+Matrixprodukt der One-Hot-Kodierung (zeilenweise in Blöcken, BLAS rechnet
+parallel); alles Weitere ist O(Paare × 25) und unabhängig von der Zeilenzahl.
+Fehlende Antworten werden paarweise ausgelassen (wie bei ``DataFrame.corr``).
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analyse.schema import LIKERT_COLS, LIKERT_VALUES
+
+METHODEN = {"pearson": "Pearson", "spearman": "Spearman", "kendall": "Kendall τ-b"}
+BLOCK_ZEILEN = 200_000  # One-Hot-Block: 200k × (Fragen·5) float64
+
+
+@dataclass
+class Korrelation:
+    """Korrelationskoeffizienten mit p-Werten und Fallzahlen je Paar."""
+
+    methode: str
+    r: pd.DataFrame
+    p: pd.DataFrame
+    n: pd.DataFrame
+
+    def umbenannt(self, namen):
+        return Korrelation(self.methode, *(t.rename(index=namen, columns=namen) for t in (self.r, self.p, self.n)))
+
+
+def kontingenztafeln(df, columns):
+    """Kreuztabellen aller Spaltenpaare, Form (K, K, 5, 5)."""
+    k, v = len(columns), len(LIKERT_VALUES)
+    tafeln = np.zeros((k * v, k * v))
+    werte = df[columns].to_numpy(dtype=float, na_value=np.nan)
+    for start in range(0, len(werte), BLOCK_ZEILEN):
+        block = werte[start:start + BLOCK_ZEILEN]
+        onehot = np.zeros((len(block), k * v))
+        zeilen, spalten = np.nonzero(np.isin(block, LIKERT_VALUES))
+        onehot[zeilen, spalten * v + block[zeilen, spalten].astype(np.int64) - 1] = 1.0
+        tafeln += onehot.T @ onehot
+    return tafeln.reshape(k, v, k, v).transpose(0, 2, 1, 3)
+
+
+def _gewichtet(tafeln, sx, sy):
+    """Pearson-Korrelation der Scores ``sx``/``sy`` (je (K, K, 5)), gewichtet mit den Tafeln."""
+    n = tafeln.sum(axis=(-2, -1))
+    zeilen, spalten = tafeln.sum(axis=-1), tafeln.sum(axis=-2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = sx - (zeilen * sx).sum(axis=-1, keepdims=True) / n[..., None]
+        dy = sy - (spalten * sy).sum(axis=-1, keepdims=True) / n[..., None]
+        kov = np.einsum("ijab,ija,ijb->ij", tafeln, dx, dy)
+        return kov / np.sqrt((zeilen * dx ** 2).sum(axis=-1) * (spalten * dy ** 2).sum(axis=-1))
+
+
+def _mittelraenge(haeufigkeiten):
+    # Bindungen bekommen den mittleren Rang ihrer Gruppe
+    return np.cumsum(haeufigkeiten, axis=-1) - haeufigkeiten + (haeufigkeiten + 1) / 2
+
+
+def _groesser(tafeln):
+    """S[a, b] = Summe der Zellen mit a' > a und b' > b."""
+    kumuliert = tafeln[..., ::-1, ::-1].cumsum(axis=-2).cumsum(axis=-1)[..., ::-1, ::-1]
+    s = np.zeros_like(tafeln)
+    s[..., :-1, :-1] = kumuliert[..., 1:, 1:]
+    return s
+
+
+def _fisher_p(r, n, faktor=1.0):
+    """Zweiseitiger p-Wert über Fishers z (Normalapproximation)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.abs(np.arctanh(np.clip(r, -1 + 1e-12, 1 - 1e-12))) * np.sqrt((n - 3) / faktor)
+    return np.where(n > 3, _p_normal(z), np.nan)
+
+
+def _p_normal(z):
+    return np.vectorize(lambda x: math.erfc(x / math.sqrt(2)) if np.isfinite(x) else np.nan)(z)
+
+
+def _kendall(tafeln):
+    """τ-b und asymptotischer p-Wert mit Bindungskorrektur (wie ``scipy.stats.kendalltau``)."""
+    n = tafeln.sum(axis=(-2, -1))
+    konkordant = (tafeln * _groesser(tafeln)).sum(axis=(-2, -1))
+    gespiegelt = tafeln[..., ::-1]
+    diskordant = (gespiegelt * _groesser(gespiegelt)).sum(axis=(-2, -1))
+
+    def bindungen(h):
+        return ((h * (h - 1) / 2).sum(axis=-1), (h * (h - 1) * (h - 2)).sum(axis=-1),
+                (h * (h - 1) * (2 * h + 5)).sum(axis=-1))
+
+    xtie, x0, x1 = bindungen(tafeln.sum(axis=-1))
+    ytie, y0, y1 = bindungen(tafeln.sum(axis=-2))
+    paare = n * (n - 1) / 2
+    differenz = konkordant - diskordant
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tau = differenz / np.sqrt((paare - xtie) * (paare - ytie))
+        m = n * (n - 1)
+        var = (m * (2 * n + 5) - x1 - y1) / 18 + 2 * xtie * ytie / m + x0 * y0 / (9 * m * (n - 2))
+        z = np.abs(differenz) / np.sqrt(var)
+    return tau, np.where(n > 2, _p_normal(z), np.nan)
+
+
+def korrelation(df, methode="pearson", columns=None):
+    """Korrelationsmatrix der Likert-Fragen nach ``methode`` (siehe ``METHODEN``)."""
+    if methode not in METHODEN:
+        raise ValueError(f"Unbekannte Methode: {methode}")
+    columns = [c for c in (columns or LIKERT_COLS) if c in df.columns]
+    tafeln = kontingenztafeln(df, columns)
+    n = tafeln.sum(axis=(-2, -1))
+    werte = np.broadcast_to(np.asarray(LIKERT_VALUES, dtype=float), tafeln.shape[:-1])
+
+    if methode == "pearson":
+        r = _gewichtet(tafeln, werte, werte)
+        p = _fisher_p(r, n)
+    elif methode == "spearman":
+        r = _gewichtet(tafeln, _mittelraenge(tafeln.sum(axis=-1)), _mittelraenge(tafeln.sum(axis=-2)))
+        # Fieller et al.: Varianz von atanh(ρ) ≈ 1.06 / (n - 3)
+        p = _fisher_p(r, n, faktor=1.06)
+    else:
+        r, p = _kendall(tafeln)
+
+    diagonale = np.eye(len(columns), dtype=bool)
+    r = np.where(diagonale, 1.0, r)
+    p = np.where(diagonale, 0.0, p)
+
+    def tabelle(werte):
+        return pd.DataFrame(werte, index=columns, columns=columns)
+    return Korrelation(methode, tabelle(r), tabelle(p), tabelle(n.astype(np.int64)))
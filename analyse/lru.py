@@ -0,0 +1,94 @@
+"""Prozessweiter LRU-Cache mit Speichergrenze und Treffer-Zählern."""
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def groesse(obj):
+    """Grobe Größe eines Cache-Eintrags in Bytes."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        mem = obj.memory_usage(deep=True, index=True)
+        return int(mem.sum()) if isinstance(mem, pd.Series) else int(mem)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(groesse(o) for o in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(groesse(o) for o in obj.values())
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Ergebnis-Objekte (CubeResult, Verteilung, Korrelation, ...) halten ihre Daten in Arrays/Frames
+        return sys.getsizeof(obj) + sum(groesse(getattr(obj, f.name)) for f in dataclasses.fields(obj))
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """Thread-sicherer LRU-Cache, begrenzt über die Gesamtgröße der Einträge.
+
+    Einträge werden von allen Sessions geteilt und dürfen deshalb nicht
+    verändert werden.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._daten = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._daten)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._daten:
+                self._daten.move_to_end(key)
+                self.hits += 1
+                return self._daten[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = groesse(value)
+        if size > self.max_bytes:
+            return  # Zu groß für den Cache -> gar nicht erst speichern
+        with self._lock:
+            if key in self._daten:
+                self._bytes -= self._daten.pop(key)[1]
+            self._daten[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, alt) = self._daten.popitem(last=False)
+                self._bytes -= alt
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._daten:
+                self._daten.move_to_end(key)
+                self.hits += 1
+                return self._daten[key][0]
+            self.misses += 1
+        # Außerhalb des Locks rechnen, damit andere Sessions nicht blockieren
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def stats(self):
+        anfragen = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / anfragen if anfragen else 0.0,
+            "eintraege": len(self._daten),
+            "bytes": self._bytes,
+        }
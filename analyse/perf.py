@@ -0,0 +1,152 @@
+"""Optionale Performance-Messung pro Rerun.
+
+Eingeschaltet wird sie über die Umgebungsvariable ``SMA_PERF=1`` (oder in der
+App über ``?perf=1`` in der URL). Dann nimmt jeder Abschnitt, der in
+``stage(...)`` läuft, Wandzeit, Spitzen-Speicher (``tracemalloc``), Anzahl
+verarbeiteter Zeilen und Cache-Treffer auf. Ist die Messung aus, kostet
+``stage`` nur einen ContextVar-Zugriff.
+
+Hinweis: ``tracemalloc`` misst prozessweit. Laufen mehrere Sessions parallel,
+enthält der Spitzenwert auch deren Allokationen. Es läuft nur, solange ein
+Lauf aktiv ist, und wird danach wieder ausgeschaltet, damit ein einzelnes
+``?perf=1`` nicht alle anderen Sessions dauerhaft bremst.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from analyse.daten import BASIS_DIR
+
+LOG_PATH = Path(os.environ.get("SMA_PERF_LOG", BASIS_DIR / "logs" / "perf.jsonl"))
+
+_aktueller_lauf = ContextVar("perf_lauf", default=None)
+_aktuelle_stufe = ContextVar("perf_stufe", default=None)
+_log_lock = threading.Lock()
+
+# Anzahl aktiver Läufe; RLock, weil die Freigabe auch aus dem Garbage Collector kommen kann
+_tracing_lock = threading.RLock()
+_aktive_laeufe = 0
+_eigenes_tracing = False
+
+
+def enabled():
+    return os.environ.get("SMA_PERF", "").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Stufe:
+    name: str
+    wall_ms: float = 0.0
+    peak_kb: float = 0.0
+    rows: int = None
+    cache: str = None  # "hit", "miss" oder None (nicht gecacht)
+    # Absoluter Spitzenwert inkl. verschachtelter Stufen (reset_peak gilt prozessweit)
+    peak_bytes: int = field(default=0, repr=False)
+
+
+@dataclass
+class Lauf:
+    """Alle Messungen eines Reruns."""
+
+    seite: str
+    zeitpunkt: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    stufen: list = field(default_factory=list)
+    gesamt_ms: float = 0.0
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def beenden(self):
+        self.gesamt_ms = (time.perf_counter() - self._start) * 1000
+
+    def als_dict(self):
+        daten = asdict(self)
+        daten.pop("_start")
+        for stufe in daten["stufen"]:
+            stufe.pop("peak_bytes")
+        return daten
+
+
+def _tracing_belegen():
+    global _aktive_laeufe, _eigenes_tracing
+    with _tracing_lock:
+        if _aktive_laeufe == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _eigenes_tracing = True
+        _aktive_laeufe += 1
+
+
+def _tracing_freigeben():
+    global _aktive_laeufe, _eigenes_tracing
+    with _tracing_lock:
+        _aktive_laeufe -= 1
+        # Nur selbst gestartetes Tracing beenden (z.B. nicht das von python -X tracemalloc)
+        if _aktive_laeufe == 0 and _eigenes_tracing:
+            tracemalloc.stop()
+            _eigenes_tracing = False
+
+
+def start(seite):
+    """Neuen Lauf beginnen (nur aufrufen, wenn die Messung eingeschaltet ist)."""
+    _tracing_belegen()
+    lauf = Lauf(seite)
+    # Läuft nur einmal: beim stop() oder, falls der Rerun per st.stop() abbricht, wenn der Lauf verschwindet
+    lauf._freigabe = weakref.finalize(lauf, _tracing_freigeben)
+    _aktueller_lauf.set(lauf)
+    return lauf
+
+
+def stop():
+    lauf = _aktueller_lauf.get()
+    _aktueller_lauf.set(None)
+    if lauf is not None:
+        lauf.beenden()
+        lauf._freigabe()
+    return lauf
+
+
+@contextmanager
+def stage(name, rows=None, cached=False):
+    """Abschnitt messen. Mit ``cached=True`` zählt er als Treffer, bis ``cache_miss()`` gerufen wird."""
+    lauf = _aktueller_lauf.get()
+    if lauf is None:
+        yield None
+        return
+
+    stufe = Stufe(name, rows=rows, cache="hit" if cached else None)
+    token = _aktuelle_stufe.set(stufe)
+    tracemalloc.reset_peak()
+    speicher_vorher = tracemalloc.get_traced_memory()[0]
+    start_zeit = time.perf_counter()
+    try:
+        yield stufe
+    finally:
+        stufe.wall_ms = (time.perf_counter() - start_zeit) * 1000
+        stufe.peak_bytes = max(stufe.peak_bytes, tracemalloc.get_traced_memory()[1])
+        stufe.peak_kb = max(stufe.peak_bytes - speicher_vorher, 0) / 1024
+        _aktuelle_stufe.reset(token)
+        eltern = _aktuelle_stufe.get()
+        if eltern is not None:
+            eltern.peak_bytes = max(eltern.peak_bytes, stufe.peak_bytes)
+        lauf.stufen.append(stufe)
+
+
+def cache_miss():
+    """Im Körper einer gecachten Funktion aufrufen - läuft nur, wenn wirklich gerechnet wird."""
+    stufe = _aktuelle_stufe.get()
+    if stufe is not None:
+        stufe.cache = "miss"
+
+
+def write_jsonl(lauf, path=LOG_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    zeile = json.dumps(lauf.als_dict(), ensure_ascii=False)
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(zeile + "\n")
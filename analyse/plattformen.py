@@ -0,0 +1,90 @@
+"""Multi-Hot-Index der genutzten Plattformen (Zeilen × Apps).
+
+Die Spalte "7. What social media platforms..." enthält kommagetrennte Listen.
+Statt bei jedem Rerun ``str.contains`` darüber laufen zu lassen (was bei
+ähnlichen Namen auch falsche Treffer liefert), wird jede Liste einmal in
+exakte Plattform-Namen zerlegt und als boolesche Matrix abgelegt.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from analyse.schema import PLATFORMS_COL
+
+APPS = ["Instagram", "TikTok", "YouTube", "Facebook", "Twitter", "Reddit", "Discord", "Snapchat", "Pinterest"]
+
+
+def _parse(eintrag):
+    return {teil.strip().lower() for teil in str(eintrag).split(",")}
+
+
+def platform_matrix(df, apps=APPS):
+    """Boolesche Matrix mit einer Spalte pro App, Index wie ``df``."""
+    spalte = df[PLATFORMS_COL]
+    if not isinstance(spalte.dtype, pd.CategoricalDtype):
+        spalte = spalte.astype("category")
+
+    # Nur die (wenigen) verschiedenen Listen parsen, nicht jede Zeile
+    namen = [app.lower() for app in apps]
+    pro_kategorie = np.array(
+        [[name in _parse(kat) for name in namen] for kat in spalte.cat.categories],
+        dtype=bool,
+    ).reshape(-1, len(apps))
+    # Letzte Zeile = "keine Angabe" (Code -1 bei fehlenden Werten)
+    pro_kategorie = np.vstack([pro_kategorie, np.zeros(len(apps), dtype=bool)])
+
+    return pd.DataFrame(pro_kategorie[spalte.cat.codes.to_numpy()], index=df.index, columns=list(apps))
+
+
+def battle(matrix, werte, app1, app2):
+    """Anzahl Nutzer und Mittelwert von ``werte`` für zwei Apps."""
+    y = werte.to_numpy(dtype=float)
+    ergebnis = {}
+    for app in (app1, app2):
+        maske = matrix[app].to_numpy()
+        n = int(maske.sum())
+        ergebnis[app] = (n, y[maske].mean() if n else float("nan"))
+    return ergebnis
+
+
+def exklusiv(matrix, werte, app1, app2):
+    """Werte der Nutzer, die nur ``app1`` bzw. nur ``app2`` nutzen.
+
+    Für den Permutationstest: Er setzt vertauschbare, also disjunkte Gruppen
+    voraus; Nutzer beider Apps stünden sonst auf beiden Seiten.
+    """
+    y = werte.to_numpy(dtype=float)
+    m1, m2 = matrix[app1].to_numpy(), matrix[app2].to_numpy()
+    return y[m1 & ~m2], y[m2 & ~m1]
+
+
+def all_pairs(matrix, werte):
+    """Alle App-Paare in einem Durchlauf über zwei Matrixprodukte.
+
+    ``M.T @ M`` liefert die Anzahl gemeinsamer Nutzer je Paar (Diagonale = Nutzer
+    pro App), ``M.T @ (M * y)`` die zugehörigen Summen der Werte.
+    """
+    apps = list(matrix.columns)
+    m = matrix.to_numpy(dtype=np.float64)
+    y = werte.to_numpy(dtype=np.float64)
+    anzahl = m.T @ m
+    summen = m.T @ (m * y[:, None])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mittel = summen / anzahl
+
+    zeilen = []
+    for i, j in itertools.combinations(range(len(apps)), 2):
+        zeilen.append({
+            "App 1": apps[i],
+            "App 2": apps[j],
+            "Nutzer 1": int(anzahl[i, i]),
+            "Ø 1": mittel[i, i],
+            "Nutzer 2": int(anzahl[j, j]),
+            "Ø 2": mittel[j, j],
+            "Differenz": mittel[j, j] - mittel[i, i],
+            "Nutzer beide": int(anzahl[i, j]),
+            "Ø beide": mittel[i, j],
+        })
+    return pd.DataFrame(zeilen)
@@ -0,0 +1,74 @@
+"""Technische Datenqualität (fehlende Werte, Duplikate, Plausibilität).
+
+Beim Laden wird pro Zeile einmal ein 64-Bit-Fingerabdruck (``hash``), ein
+Fingerabdruck der Kernmerkmale (``kern_hash``, für Beinahe-Duplikate) und
+eine Null-Bitmap berechnet. Duplikate und fehlende Werte einer beliebigen
+Teilmenge sind danach nur noch Reduktionen über diese Spalten, statt bei
+jeder Filteränderung alle Spalten aller Zeilen neu zu hashen.
+"""
+import numpy as np
+import pandas as pd
+
+from analyse.schema import AGE_BOUNDS, AGE_COL, LIKERT_COLS, LIKERT_VALUES, OCCUPATION_COL, PLATFORMS_COL, TIME_COL
+
+# Beinahe-Duplikat: gleiche Person laut Alter, Beruf und allen Likert-Antworten,
+# aber z.B. andere Plattform-Liste oder Nutzungszeit
+KERN_COLS = [AGE_COL, OCCUPATION_COL] + LIKERT_COLS
+
+
+def fingerprints(df):
+    """Zeilen-Hash, Kern-Hash und Null-Bitmap (Index wie ``df``)."""
+    kern = [c for c in KERN_COLS if c in df.columns]
+    nullen = df.isna().to_numpy()
+    # Bit j = Spalte j fehlt (bei mehr als 64 Spalten zählt n_null trotzdem alle)
+    bits = np.left_shift(np.uint64(1), np.arange(min(nullen.shape[1], 64), dtype=np.uint64))
+    bitmap = (nullen[:, :64] * bits).sum(axis=1, dtype=np.uint64) if len(bits) else np.zeros(len(df), np.uint64)
+    return pd.DataFrame({
+        "hash": pd.util.hash_pandas_object(df, index=False).to_numpy(),
+        "kern_hash": pd.util.hash_pandas_object(df[kern], index=False).to_numpy(),
+        "null_bitmap": bitmap,
+        "n_null": nullen.sum(axis=1).astype(np.uint16),
+    }, index=df.index)
+
+
+def basis_check(df, fp=None):
+    """Anzahl fehlender Werte und doppelter Zeilen.
+
+    Mit ``fp`` (aus ``fingerprints``) wird nur über die vorberechneten Spalten
+    reduziert; ohne wird klassisch über den DataFrame gerechnet.
+    """
+    if fp is None:
+        return int(df.isnull().sum().sum()), int(df.duplicated().sum())
+    teil = fp.loc[df.index]
+    hashes = teil["hash"].to_numpy()
+    return int(teil["n_null"].sum()), int(len(hashes) - len(np.unique(hashes)))
+
+
+def near_duplicates(fp):
+    """Zeilen mit gleichem Kern, die keine exakten Duplikate sind."""
+    kern_dup = fp["kern_hash"].duplicated(keep=False)
+    exakt_dup = fp["hash"].duplicated(keep=False)
+    return int((kern_dup & ~exakt_dup).sum())
+
+
+def bericht(roh, df, fp):
+    """Erweiterter Qualitätsbericht über Rohdaten und bereinigten Stand."""
+    zeilen = [
+        ("roh", "Zeilen", len(roh)),
+        ("bereinigt", "Zeilen", len(df)),
+        ("bereinigt", "Fehlende Werte", int(fp["n_null"].sum())),
+        ("bereinigt", "Exakte Duplikate", int(fp["hash"].duplicated().sum())),
+        ("bereinigt", "Beinahe-Duplikate (gleicher Kern, andere Plattform/Nutzungszeit)", near_duplicates(fp)),
+    ]
+    if AGE_COL in roh.columns:
+        alter = pd.to_numeric(roh[AGE_COL], errors="coerce")
+        unplausibel = ~alter.between(*AGE_BOUNDS) & alter.notna()
+        zeilen.append(("roh", f"Unplausibles Alter (außerhalb {AGE_BOUNDS[0]}-{AGE_BOUNDS[1]})", int(unplausibel.sum())))
+    for col in [c for c in LIKERT_COLS if c in roh.columns]:
+        werte = pd.to_numeric(roh[col], errors="coerce")
+        ausserhalb = int((~werte.isin(LIKERT_VALUES) & werte.notna()).sum())
+        if ausserhalb:
+            zeilen.append(("roh", f"Likert außerhalb 1-5: {col}", ausserhalb))
+    for col in [c for c in (OCCUPATION_COL, PLATFORMS_COL, TIME_COL) if c in roh.columns]:
+        zeilen.append(("roh", f"Fehlend: {col}", int(roh[col].isna().sum())))
+    return pd.DataFrame(zeilen, columns=["Stufe", "Prüfung", "Anzahl"])
@@ -0,0 +1,30 @@
+"""Gerenderte Diagramme als PNG-Bytes cachen.
+
+Ein unverändertes Diagramm kostet dann nur noch eine Byte-Kopie statt eines
+kompletten Seaborn-Renders. Jede Figur wird nach dem Export explizit mit
+``plt.close`` geschlossen, damit der Speicher über Reruns nicht wächst.
+"""
+import io
+import threading
+
+# pyplot ist nicht thread-sicher, Streamlit-Sessions laufen aber in Threads
+_RENDER_LOCK = threading.Lock()
+
+PNG_DPI = 200
+
+
+def figure_to_png(fig, dpi=PNG_DPI):
+    """Figur als PNG exportieren und danach schließen."""
+    import matplotlib.pyplot as plt
+
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def render_png(draw, *args, dpi=PNG_DPI):
+    with _RENDER_LOCK:
+        return figure_to_png(draw(*args), dpi=dpi)
@@ -0,0 +1,106 @@
+"""Explizites Spalten-Schema, das beim Laden angewendet wird.
+
+Die Likert-Antworten (1-5) werden als ``int8`` gespeichert, die Label-Spalten
+als geordnete Categoricals. Filter, Übersetzung und Einteilung stehen als
+Regeln in ``analyse.bereinigung``.
+"""
+import pandas as pd
+
+# --- SPALTENNAMEN ---
+AGE_COL = '1. What is your age?'
+OCCUPATION_COL = '4. Occupation Status'
+USES_SOCIAL_MEDIA_COL = "6. Do you use social media?"
+PLATFORMS_COL = '7. What social media platforms do you commonly use?'
+TIME_COL = '8. What is the average time you spend on social media every day?'
+USAGE_COL = 'Nutzungszeit_Kategorie'
+DEPRESSION_COL = '18. How often do you feel depressed or down?'
+WORRIES_COL = '13. On a scale of 1 to 5, how much are you bothered by worries?'
+SLEEP_COL = '20. On a scale of 1 to 5, how often do you face issues regarding sleep?'
+COMPARISON_COL = '15. On a scale of 1-5, how often do you compare yourself to other successful people through the use of social media?'
+
+# Fragen 9-20 (Skala 1-5)
+LIKERT_COLS = [
+    '9. How often do you find yourself using Social media without a specific purpose?',
+    '10. How often do you get distracted by Social media when you are busy doing something?',
+    '11. Do you feel restless if you haven\'t used Social media in a while?',
+    '12. On a scale of 1 to 5, how easily distracted are you?',
+    WORRIES_COL,
+    '14. Do you find it difficult to concentrate on things?',
+    COMPARISON_COL,
+    '16. How do you feel about these comparisons, generally speaking?',
+    '17. How often do you look to seek validation from features of social media?',
+    DEPRESSION_COL,
+    '19. On a scale of 1 to 5, how frequently does your interest in daily activities fluctuate?',
+    SLEEP_COL,
+]
+LIKERT_VALUES = (1, 2, 3, 4, 5)
+
+# Plausible Altersgrenzen für die Umfrage (der frühere Sonderfall "91" fällt darunter)
+AGE_BOUNDS = (10, 90)
+
+uebersetzung = {
+    "University Student": "Student (Uni)",
+    "School Student": "Schüler",
+    "Salaried Worker": "Angestellter",
+    "Retired": "Rentner"
+}
+
+# Reihenfolge der Kategorien (Rohwerte, vor der Übersetzung)
+OCCUPATION_ORDER = ["School Student", "University Student", "Salaried Worker", "Retired"]
+TIME_ORDER = [
+    "Less than an Hour",
+    "Between 1 and 2 hours",
+    "Between 2 and 3 hours",
+    "Between 3 and 4 hours",
+    "Between 4 and 5 hours",
+    "More than 5 hours",
+]
+USAGE_ORDER = ["Wenig", "Mittel", "Viel"]
+
+# Nutzungsdauer (Frage 8) -> Nutzungszeit_Kategorie, für Exporte ohne diese Spalte
+USAGE_BUCKETS = {
+    "Less than an Hour": "Wenig",
+    "Between 1 and 2 hours": "Wenig",
+    "Between 2 and 3 hours": "Mittel",
+    "Between 3 and 4 hours": "Mittel",
+    "Between 4 and 5 hours": "Viel",
+    "More than 5 hours": "Viel",
+}
+
+# Label-Spalten schon beim CSV-Parsen als Kategorie einlesen (spart die Python-Strings)
+READ_DTYPES = {col: "category" for col in [OCCUPATION_COL, PLATFORMS_COL, TIME_COL, USAGE_COL]}
+
+
+def _ordered(series, order):
+    # Unbekannte Werte werden hinten angehängt statt still zu NaN zu werden
+    extra = sorted(set(series.dropna().unique()) - set(order))
+    return pd.Categorical(series, categories=list(order) + extra, ordered=True)
+
+
+def apply_schema(df):
+    """Kompakte Datentypen setzen (gibt einen neuen DataFrame zurück)."""
+    # Flache Kopie: ersetzte Spalten werden neu angelegt, die übrigen nicht kopiert
+    df = df.copy(deep=False)
+    for col in LIKERT_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("Int8" if df[col].isna().any() else "int8")
+    if AGE_COL in df.columns:
+        df[AGE_COL] = df[AGE_COL].astype("Int16" if df[AGE_COL].isna().any() else "int16")
+    if OCCUPATION_COL in df.columns:
+        df[OCCUPATION_COL] = _ordered(df[OCCUPATION_COL], OCCUPATION_ORDER)
+    if TIME_COL in df.columns:
+        df[TIME_COL] = _ordered(df[TIME_COL], TIME_ORDER)
+    if USAGE_COL in df.columns:
+        df[USAGE_COL] = _ordered(df[USAGE_COL], USAGE_ORDER)
+    if PLATFORMS_COL in df.columns:
+        # Es gibt nur wenige verschiedene Kombinationen -> als Kategorie speichern
+        df[PLATFORMS_COL] = df[PLATFORMS_COL].astype("category")
+    return df
+
+
+def categories(series):
+    """Tatsächlich vorkommende Kategorien in der festgelegten Reihenfolge."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        present = set(series.dropna().unique())
+        return [c for c in series.cat.categories if c in present]
+    return list(series.dropna().unique())
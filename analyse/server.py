@@ -0,0 +1,190 @@
+"""Lokaler HTTP/JSON-Endpunkt für ``analyse.abfrage``.
+
+Aufruf::
+
+    python -m analyse.server --port 8765 --threads 8
+
+Beispiele::
+
+    GET /mittelwerte?frage=Depression&nach=nutzung&beruf=Student%20(Uni)&alter=18-25
+    GET /battle?app1=Instagram&app2=TikTok
+    GET /paare?zeit=Viel
+    GET /korrelation?methode=kendall
+    GET /statistik
+    POST /kohorten  {"a": {"zeiten": ["Wenig"]}, "b": {"zeiten": ["Viel"], "apps": ["TikTok"]}}
+    GET /kategorien
+    GET /status
+
+Filter: ``beruf`` und ``zeit`` dürfen mehrfach vorkommen, ``alter`` ist
+``von-bis``. Statt Query-Parametern kann auch ein JSON-Objekt per POST
+geschickt werden (Listen als JSON-Arrays). Alle Threads teilen denselben
+Datensatz und denselben Ergebnis-Cache; Anfragen werden von einem Pool mit
+fester Größe bearbeitet, damit Lasttests die Maschine nicht überrennen.
+"""
+import argparse
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from analyse.abfrage import Abfragen
+
+LISTEN = {"beruf", "zeit"}
+TEXTE = {"frage", "nach", "app1", "app2", "methode"}
+OBJEKTE = {"a", "b"}
+
+
+class ParameterFehler(Exception):
+    """Parameter der Anfrage passen nicht (Antwort 400)."""
+
+
+class PoolHTTPServer(HTTPServer):
+    """HTTPServer, der Anfragen in einem Thread-Pool fester Größe bearbeitet."""
+
+    def __init__(self, adresse, handler, api, threads):
+        super().__init__(adresse, handler)
+        self.api = api
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="abfrage")
+        self.gestartet = time.time()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._bearbeiten, request, client_address)
+
+    def _bearbeiten(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def _parameter(query, body):
+    """Query-String und JSON-Body zu einem Dict zusammenführen."""
+    werte = {k: (v if k in LISTEN else v[-1]) for k, v in parse_qs(query).items()}
+    werte.update(body)
+    for k in LISTEN:
+        if isinstance(werte.get(k), str):
+            werte[k] = [werte[k]]
+    alter = werte.get("alter")
+    if isinstance(alter, str):
+        von, _, bis = alter.partition("-")
+        try:
+            werte["alter"] = (int(von), int(bis or von))
+        except ValueError:
+            raise ParameterFehler(f"'alter' muss 'von-bis' sein, nicht '{alter}'") from None
+    _typen_pruefen(werte)
+    return werte
+
+
+def _typen_pruefen(werte):
+    # Falsche JSON-Typen (z.B. {"frage": 5}) als 400 melden statt tief in Abfragen zu scheitern
+    for k in TEXTE & werte.keys():
+        if werte[k] is not None and not isinstance(werte[k], str):
+            raise ParameterFehler(f"'{k}' muss ein Text sein")
+    for k in LISTEN & werte.keys():
+        if werte[k] is not None and not (isinstance(werte[k], list) and all(isinstance(v, str) for v in werte[k])):
+            raise ParameterFehler(f"'{k}' muss ein Text oder eine Liste von Texten sein")
+    for k in OBJEKTE & werte.keys():
+        if werte[k] is not None and not isinstance(werte[k], dict):
+            raise ParameterFehler(f"'{k}' muss ein JSON-Objekt sein")
+    alter = werte.get("alter")
+    if alter is not None and not (isinstance(alter, (list, tuple)) and len(alter) == 2
+                                  and all(isinstance(a, int) and not isinstance(a, bool) for a in alter)):
+        raise ParameterFehler("'alter' muss 'von-bis' oder [von, bis] sein")
+
+
+def _filter(p):
+    return {"berufe": p.get("beruf"), "zeiten": p.get("zeit"), "alter": p.get("alter")}
+
+
+ROUTEN = {
+    "/mittelwerte": lambda api, p: api.mittelwerte(p.get("frage", "Depression"), p.get("nach"), **_filter(p)),
+    "/statistik": lambda api, p: api.statistik(**_filter(p)),
+    "/battle": lambda api, p: api.battle(p.get("app1", "Instagram"), p.get("app2", "TikTok"), **_filter(p)),
+    "/paare": lambda api, p: api.app_paare(**_filter(p)),
+    "/kohorten": lambda api, p: api.kohorten_vergleich(p.get("a"), p.get("b")),
+    "/korrelation": lambda api, p: api.korrelation(p.get("methode", "pearson"), **_filter(p)),
+    "/kategorien": lambda api, p: api.kategorien(),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "SocialMediaAnalyse/1.0"
+
+    def do_GET(self):
+        self._antworten({})
+
+    def do_POST(self):
+        laenge = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(laenge) or b"{}")
+        except json.JSONDecodeError as fehler:
+            return self._senden(400, {"fehler": f"Ungültiges JSON: {fehler}"})
+        if not isinstance(body, dict):
+            return self._senden(400, {"fehler": "JSON-Objekt erwartet"})
+        self._antworten(body)
+
+    def _antworten(self, body):
+        teile = urlsplit(self.path)
+        if teile.path == "/status":
+            return self._senden(200, {"zeilen": len(self.server.api.df), "cache": self.server.api.cache.stats(),
+                                      "laufzeit_s": round(time.time() - self.server.gestartet, 1)})
+        route = ROUTEN.get(teile.path)
+        if route is None:
+            return self._senden(404, {"fehler": f"Unbekannter Pfad: {teile.path}", "pfade": sorted(ROUTEN)})
+        try:
+            ergebnis = route(self.server.api, _parameter(teile.query, body))
+        except (ParameterFehler, ValueError) as fehler:
+            # ValueError = Abfragen lehnt die Werte ab (unbekannte Frage, App, Kategorie, ...)
+            return self._senden(400, {"fehler": str(fehler)})
+        except Exception as fehler:  # Jede Anfrage bekommt eine Antwort, auch bei einem Fehler im Server
+            traceback.print_exc()
+            return self._senden(500, {"fehler": f"Interner Fehler: {type(fehler).__name__}"})
+        self._senden(200, ergebnis)
+
+    def _senden(self, status, daten):
+        inhalt = json.dumps(daten, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(inhalt)))
+        self.end_headers()
+        self.wfile.write(inhalt)
+
+    def log_message(self, format, *args):
+        if os.environ.get("SMA_SERVER_LOG"):
+            super().log_message(format, *args)
+
+
+def _json_default(obj):
+    # numpy-Skalare (z.B. aus DataFrame-Zeilen) in Python-Zahlen umwandeln
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Nicht serialisierbar: {type(obj).__name__}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokale JSON-Abfragen auf dem Datensatz")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="Größe des Thread-Pools")
+    args = parser.parse_args(argv)
+
+    api = Abfragen()
+    with PoolHTTPServer((args.host, args.port), Handler, api, args.threads) as server:
+        print(f"{len(api.df)} Zeilen geladen, höre auf http://{args.host}:{args.port} ({args.threads} Threads)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Kennzahlen aus Häufigkeiten statt aus einzelnen Zeilen.
+
+Die Likert-Antworten kennen nur die Werte 1-5 und das Alter nur wenige
+Dutzend Werte. Mittelwert, Streuung und Quantile lassen sich deshalb exakt
+aus den Häufigkeiten pro Wert berechnen - unabhängig von der Zeilenzahl.
+Dazu kommt die t-Verteilung für Welch-Intervalle (scipy ist keine Abhängigkeit).
+"""
+import math
+import statistics
+
+import numpy as np
+
+
+def quantile_from_counts(counts, values, q):
+    """Quantil wie ``np.quantile`` (lineare Interpolation) aus Häufigkeiten."""
+    counts = np.asarray(counts)
+    values = np.asarray(values, dtype=float)
+    n = counts.sum()
+    if n == 0:
+        return np.nan
+    kumuliert = np.cumsum(counts)
+    pos = q * (n - 1)
+    unten, oben = int(np.floor(pos)), int(np.ceil(pos))
+    # Wert an sortierter Position i = erster Wert, dessen kumulierte Anzahl > i ist
+    v_unten = values[np.searchsorted(kumuliert, unten, side="right")]
+    v_oben = values[np.searchsorted(kumuliert, oben, side="right")]
+    return v_unten + (v_oben - v_unten) * (pos - unten)
+
+
+def describe_from_counts(counts, values):
+    """Entspricht ``Series.describe()`` für eine Verteilung in Häufigkeiten."""
+    counts = np.asarray(counts, dtype=float)
+    values = np.asarray(values, dtype=float)
+    n = counts.sum()
+    if n == 0:
+        return {"count": 0.0, "mean": np.nan, "std": np.nan, "min": np.nan,
+                "25%": np.nan, "50%": np.nan, "75%": np.nan, "max": np.nan}
+    summe = counts @ values
+    quadratsumme = counts @ values ** 2
+    return {
+        "count": n,
+        "mean": summe / n,
+        "std": std_from_sums(n, summe, quadratsumme),
+        "min": values[counts > 0].min(),
+        "25%": quantile_from_counts(counts, values, 0.25),
+        "50%": quantile_from_counts(counts, values, 0.5),
+        "75%": quantile_from_counts(counts, values, 0.75),
+        "max": values[counts > 0].max(),
+    }
+
+
+def std_from_sums(n, summe, quadratsumme):
+    """Stichproben-Standardabweichung (ddof=1) aus Anzahl, Summe und Quadratsumme."""
+    n = np.asarray(n, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        varianz = (quadratsumme - summe ** 2 / n) / (n - 1)
+    return np.sqrt(np.clip(varianz, 0, None))
+
+
+# --- t-VERTEILUNG (ohne scipy) ---
+def _beta_regularisiert(a, b, x):
+    """Regularisierte unvollständige Betafunktion I_x(a, b) (Kettenbruch nach Lentz)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        # Kettenbruch konvergiert nur links davon schnell -> Symmetrie nutzen
+        return 1.0 - _beta_regularisiert(b, a, 1 - x)
+    vorfaktor = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                         + a * math.log(x) + b * math.log1p(-x)) / a
+    klein = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > klein else klein)
+    f = d
+    for m in range(1, 300):
+        for zaehler in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                        -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + zaehler * d
+            d = 1.0 / (d if abs(d) > klein else klein)
+            c = 1.0 + zaehler / c
+            c = c if abs(c) > klein else klein
+            f *= c * d
+        if abs(c * d - 1.0) < 1e-14:
+            break
+    return vorfaktor * f
+
+
+def t_sf(t, df):
+    """P(T > t) der Student-t-Verteilung mit ``df`` Freiheitsgraden."""
+    if not (np.isfinite(t) and df > 0):
+        return np.nan
+    halb = 0.5 * _beta_regularisiert(df / 2, 0.5, df / (df + t * t))
+    return halb if t >= 0 else 1.0 - halb
+
+
+def t_quantil(q, df):
+    """Quantil der Student-t-Verteilung für ``0.5 <= q < 1`` (Newton-Verfahren)."""
+    if not (df > 0 and 0.5 <= q < 1):
+        return np.nan
+    ziel = 1.0 - q
+    # Start beim Normal-Quantil: liegt links der Lösung, t_sf ist dort konvex -> monotone Konvergenz
+    t = statistics.NormalDist().inv_cdf(q)
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    for _ in range(100):
+        dichte = math.exp(log_norm - (df + 1) / 2 * math.log1p(t * t / df))
+        schritt = (t_sf(t, df) - ziel) / dichte
+        t += schritt
+        if abs(schritt) < 1e-10 * max(1.0, abs(t)):
+            break
+    return t
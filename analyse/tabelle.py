@@ -0,0 +1,103 @@
+"""Serverseitig paginierte, spaltenprojizierte Tabellenansicht.
+
+An den Browser geht nur die sichtbare Seite mit den gewählten Spalten.
+Suche und Sortierung laufen hier auf dem Server und liefern eine
+Zeilenreihenfolge (Positionen), die pro Filter/Suche/Sortierung gecacht
+werden kann; das Blättern ist danach nur noch ein ``iloc``-Slice.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Ansicht:
+    spalten: tuple
+    suche: str = ""
+    sortierung: str = None
+    absteigend: bool = False
+    seitengroesse: int = 50
+
+
+def _treffer(spalte, suche, positionen):
+    """Boolesche Maske über ``positionen``: ``suche`` kommt (ohne Groß/Klein) im Wert vor."""
+    if isinstance(spalte.dtype, pd.CategoricalDtype):
+        # Nur die Kategorien durchsuchen, dann über die Codes auf die Zeilen abbilden
+        kategorien = pd.Series(spalte.cat.categories.astype(str))
+        kat_treffer = np.append(kategorien.str.contains(suche, case=False, regex=False).to_numpy(), False)
+        return kat_treffer[spalte.cat.codes.to_numpy()[positionen]]
+    if pd.api.types.is_numeric_dtype(spalte.dtype):
+        try:
+            zahl = float(suche)
+        except ValueError:
+            return np.zeros(len(positionen), dtype=bool)
+        return (spalte.iloc[positionen] == zahl).to_numpy(dtype=bool, na_value=False)
+    teil = spalte.iloc[positionen].astype(str)
+    return teil.str.contains(suche, case=False, regex=False).to_numpy(dtype=bool, na_value=False)
+
+
+def reihenfolge(df, ansicht, positionen=None):
+    """Positionen der Zeilen nach Suche und Sortierung.
+
+    ``positionen`` schränkt auf eine Filter-Auswahl ein (Standard: alle Zeilen).
+    """
+    positionen = np.arange(len(df)) if positionen is None else np.asarray(positionen)
+    suche = ansicht.suche.strip()
+    if suche:
+        maske = np.zeros(len(positionen), dtype=bool)
+        for col in ansicht.spalten:
+            maske |= _treffer(df[col], suche, positionen)
+        positionen = positionen[maske]
+
+    if ansicht.sortierung:
+        spalte = df[ansicht.sortierung]
+        werte = spalte.cat.codes.to_numpy() if isinstance(spalte.dtype, pd.CategoricalDtype) else spalte.to_numpy()
+        order = np.argsort(werte[positionen], kind="stable")
+        if ansicht.absteigend:
+            order = order[::-1]
+        positionen = positionen[order]
+    return positionen
+
+
+def seite(df, positionen, ansicht, nummer):
+    """Eine Seite (1-basiert) als kleiner DataFrame mit den gewählten Spalten."""
+    start = (nummer - 1) * ansicht.seitengroesse
+    teil = df.iloc[positionen[start:start + ansicht.seitengroesse]][list(ansicht.spalten)]
+    return kompakt(teil)
+
+
+def kompakt(teil):
+    """Kategorien auf die sichtbaren Werte reduzieren.
+
+    Arrow serialisiert bei Categoricals sonst das komplette Wörterbuch mit,
+    auch wenn die Seite nur wenige Zeilen hat.
+    """
+    teil = teil.copy()
+    for col in teil.columns:
+        if isinstance(teil[col].dtype, pd.CategoricalDtype):
+            teil[col] = teil[col].cat.remove_unused_categories()
+    return teil
+
+
+def seitenzahl(anzahl, seitengroesse):
+    return max(1, -(-anzahl // seitengroesse))
+
+
+def spalten_info(df, fp, positionen):
+    """Datentyp und Anzahl nicht-leerer Werte je Spalte aus der Null-Bitmap.
+
+    ``fp`` ist das Ergebnis von ``qualitaet.fingerprints`` für den gesamten
+    Datensatz, ``positionen`` die Zeilen der Filter-Auswahl.
+    """
+    bitmap = fp["null_bitmap"].to_numpy()[positionen]
+    info = df.dtypes.astype(str).to_frame(name="Typ")
+    anzahl = []
+    for j in range(len(df.columns)):
+        if j < 64:
+            nullen = int(np.count_nonzero((bitmap >> np.uint64(j)) & np.uint64(1)))
+        else:
+            nullen = int(df.iloc[positionen, j].isna().sum())
+        anzahl.append(len(positionen) - nullen)
+    info["Count"] = anzahl
+    return info
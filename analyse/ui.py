@@ -0,0 +1,504 @@
+"""Streamlit-spezifische Helfer, die von allen Seiten genutzt werden."""
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from analyse import (bootstrap, cube, daten, diagramme, kohorten, perf, plattformen, qualitaet, render, tabelle,
+                     verteilung)
+from analyse.filter import FilterState
+from analyse.lru import LRUCache
+from analyse.schema import COMPARISON_COL, DEPRESSION_COL, USAGE_COL, WORRIES_COL
+
+
+# perf.cache_miss() steht im Körper der gecachten Funktionen und läuft deshalb nur bei einem Miss.
+# Die _load_*-Funktionen gelten für den Grunddatensatz (CSV); eingespielte Wellen werden über
+# _fortschreiben angehängt, sodass eine neue Welle nur ihre eigenen Zeilen kostet.
+# st.cache_resource statt st.cache_data: Alle Sessions teilen dasselbe (schreibgeschützte) Objekt,
+# statt bei jedem Aufruf eine deserialisierte Kopie zu bekommen. Nicht verändern!
+@st.cache_resource
+def _load_data():
+    perf.cache_miss()
+    return daten.load_data(wellen_dir=None)
+
+
+@st.cache_resource
+def _fortgeschrieben():
+    # Prozessweit: Name -> (Wellen-Stand, Wert)
+    return {}, threading.Lock()
+
+
+def _stand():
+    # Das Manifest ist klein und wird bei jedem Rerun gelesen -> neue Wellen ohne Neustart
+    return tuple((e["id"], e["zeilen"]) for e in daten.wellen())
+
+
+def _fortschreiben(name, stand, basis, anhaengen):
+    """Wert für ``stand`` aus dem zuletzt berechneten Stand plus den neuen Wellen.
+
+    ``anhaengen(wert, neue)`` bekommt die fehlenden ``(id, zeilen)``-Einträge.
+    """
+    speicher, lock = _fortgeschrieben()
+    with lock:
+        alt, wert = speicher.get(name, ((), None))
+        if wert is None or stand[:len(alt)] != alt:
+            # Erster Aufruf oder Manifest zurückgesetzt: vom Grunddatensatz aus aufbauen
+            alt, wert = (), basis()
+        if stand != alt:
+            perf.cache_miss()
+            wert = anhaengen(wert, stand[len(alt):])
+        speicher[name] = (stand, wert)
+    return wert
+
+
+def _neue_zeilen(df, neue):
+    return df.iloc[len(df) - sum(zeilen for _, zeilen in neue):]
+
+
+def load_data():
+    with perf.stage("load_data", cached=True) as stufe:
+        if _load_data() is None:
+            return None
+        df = _fortschreiben(
+            "daten", _stand(), _load_data,
+            lambda df, neue: daten.anhaengen(df, [daten.read_welle(i) for i, _ in neue], [i for i, _ in neue]),
+        )
+        if stufe is not None:
+            stufe.rows = len(df)
+    return df
+
+
+def _stand_von(df):
+    # Abgeleitete Werte folgen dem Stand des geladenen Datensatzes, nicht einem neueren Manifest
+    return df.attrs.get("wellen", ())
+
+
+@st.cache_resource
+def _load_platforms():
+    perf.cache_miss()
+    return plattformen.platform_matrix(_load_data())
+
+
+def load_platforms():
+    # Wird nur einmal pro Datensatz geparst; Index passt zu load_data()
+    with perf.stage("load_platforms", cached=True):
+        df = load_data()
+        return _fortschreiben("plattformen", _stand_von(df), _load_platforms,
+                              lambda m, neue: pd.concat([m, plattformen.platform_matrix(_neue_zeilen(df, neue))]))
+
+
+@st.cache_resource
+def _load_cube():
+    perf.cache_miss()
+    return cube.AggregateCube(_load_data())
+
+
+def load_cube():
+    with perf.stage("load_cube", cached=True):
+        df = load_data()
+        return _fortschreiben("cube", _stand_von(df), _load_cube,
+                              lambda c, neue: c.erweitert(_neue_zeilen(df, neue)))
+
+
+@st.cache_resource
+def _load_kohorten():
+    perf.cache_miss()
+    return kohorten.GruppenTabelle(_load_data())
+
+
+def load_kohorten():
+    # Suffiziente Statistiken je (Beruf, Nutzung, Alter, Plattform-Liste) für den Kohorten-Vergleich
+    with perf.stage("load_kohorten", cached=True):
+        df = load_data()
+        return _fortschreiben("kohorten", _stand_von(df), _load_kohorten,
+                              lambda t, neue: t.erweitert(_neue_zeilen(df, neue)))
+
+
+@st.cache_resource
+def _load_fingerprints():
+    perf.cache_miss()
+    return daten.load_artifact("fingerprints", lambda: qualitaet.fingerprints(_load_data()))
+
+
+def load_fingerprints():
+    # Zeilen-Hash + Null-Bitmap, einmal pro Datenstand berechnet und neben den Daten gecacht
+    with perf.stage("load_fingerprints", cached=True):
+        df = load_data()
+        return _fortschreiben("fingerprints", _stand_von(df), _load_fingerprints,
+                              lambda fp, neue: pd.concat([fp, qualitaet.fingerprints(_neue_zeilen(df, neue))]))
+
+
+@st.cache_data
+def _load_quality_report():
+    perf.cache_miss()
+    # Bezieht sich auf die CSV (Roh- und bereinigter Stand), nicht auf eingespielte Wellen
+    return daten.load_artifact(
+        "qualitaet", lambda: qualitaet.bericht(daten.read_raw(), _load_data(), _load_fingerprints())
+    )
+
+
+def load_quality_report():
+    with perf.stage("load_quality_report", cached=True):
+        return _load_quality_report()
+
+
+@st.cache_data
+def _load_cleaning_report(stand):
+    perf.cache_miss()
+    bericht = daten.cleaning_report()
+    eintraege = daten.wellen()
+    if eintraege:
+        # Wellen wurden beim Einspielen bereinigt; ihre Zahlen stehen im Manifest
+        wellen = [sum(e.get("bereinigung", {}).get(regel, 0) for e in eintraege) for regel in bericht["Regel"]]
+        bericht = bericht.assign(**{"davon Wellen": wellen})
+        bericht["Zeilen entfernt"] += bericht["davon Wellen"]
+    return bericht
+
+
+def load_cleaning_report():
+    # Eine Zeile pro Regel aus analyse.bereinigung: CSV plus eingespielte Wellen
+    with perf.stage("load_cleaning_report", cached=True):
+        return _load_cleaning_report(_stand())
+
+
+# --- GEMEINSAMER FILTER-ZUSTAND & CACHE ---
+FILTER_CACHE_BYTES = 256 * 1024 ** 2
+
+
+@st.cache_resource
+def filter_cache():
+    # Ein Cache pro Server-Prozess, geteilt von allen Browser-Sessions
+    return LRUCache(FILTER_CACHE_BYTES)
+
+
+def _uebernehmen():
+    # on_change: Widget-Werte in den geteilten Zustand übernehmen (läuft vor dem Rerun)
+    st.session_state["filter_state"] = FilterState(
+        tuple(st.session_state["_filter_beruf"]),
+        tuple(st.session_state["_filter_zeit"]),
+        tuple(st.session_state["_filter_alter"]),
+    )
+
+
+def sidebar_filter(df, header, labels):
+    """Sidebar-Filter rendern; der Zustand wird zwischen den Seiten geteilt.
+
+    ``labels`` enthält die Beschriftungen für Beruf, Nutzungsdauer und Alter.
+    """
+    standard = FilterState.default(df)
+    state = st.session_state.get("filter_state") or standard
+    state = state.restrict(df)
+    st.session_state["filter_state"] = state
+
+    # Widget-Werte gehen beim Seitenwechsel verloren -> bei jedem Lauf aus dem geteilten Zustand setzen
+    st.session_state["_filter_beruf"] = list(state.berufe)
+    st.session_state["_filter_zeit"] = list(state.zeiten)
+    st.session_state["_filter_alter"] = state.alter
+
+    st.sidebar.header(header)
+    st.sidebar.multiselect(labels[0], options=list(standard.berufe), key="_filter_beruf", on_change=_uebernehmen)
+    st.sidebar.multiselect(labels[1], options=list(standard.zeiten), key="_filter_zeit", on_change=_uebernehmen)
+    st.sidebar.slider(labels[2], standard.alter[0], standard.alter[1], key="_filter_alter", on_change=_uebernehmen)
+    return state
+
+
+def cached(name, df, state, compute):
+    """Abgeleitetes Ergebnis über den prozessweiten Cache holen."""
+    key = (name, df.attrs.get("fingerprint"), state.key())
+
+    def berechnen():
+        perf.cache_miss()
+        return compute()
+
+    with perf.stage(f"cache:{name}", cached=True):
+        return filter_cache().get_or_compute(key, berechnen)
+
+
+def filter_positions(df, state):
+    """Zeilenpositionen der Filter-Auswahl; gecacht wird nur das Index-Array."""
+    return cached("positionen", df, state, lambda: state.positions(df))
+
+
+def filtered_frame(df, state):
+    # Materialisiert eine Kopie -> nur in Cache-Misses abgeleiteter Ergebnisse aufrufen
+    return df.iloc[filter_positions(df, state)]
+
+
+def cache_status():
+    stats = filter_cache().stats()
+    st.sidebar.caption(
+        f"Filter-Cache: {stats['hits']} Treffer / {stats['misses']} neu berechnet "
+        f"({stats['hit_rate']:.0%}), {stats['eintraege']} Einträge, {stats['bytes'] / 1024 ** 2:.1f} MB"
+    )
+
+
+# --- GEMEINSAME AUSWERTUNGEN (Seiten und Vorwärmen nutzen dieselben Cache-Schlüssel) ---
+def auswertung(df, state):
+    # Kennzahlen für die Filter-Kombination aus dem Würfel (O(Zellen) statt O(Zeilen))
+    return cached("auswertung", df, state, lambda: load_cube().query(state.berufe, state.zeiten, state.alter))
+
+
+def qualitaets_check(df, state):
+    # Über die beim Laden berechneten Zeilen-Hashes/Null-Bitmaps statt duplicated() über alle Spalten
+    return cached("qualitaet", df, state,
+                  lambda: qualitaet.basis_check(filtered_frame(df, state), load_fingerprints()))
+
+
+def spalten_info(df, state):
+    # Anzahl nicht-leerer Werte kommt aus der Null-Bitmap
+    return cached("spalten_info", df, state,
+                  lambda: tabelle.spalten_info(df, load_fingerprints(), filter_positions(df, state)))
+
+
+def verteilung_nutzung(df, state):
+    # Häufigkeiten aller Likert-Fragen je Kategorie (ein Durchlauf)
+    return cached("verteilung_nutzung", df, state,
+                  lambda: verteilung.likert_counts(filtered_frame(df, state), USAGE_COL))
+
+
+def verteilung_vergleich(df, state):
+    return cached("verteilung_vergleich", df, state,
+                  lambda: verteilung.likert_counts(filtered_frame(df, state), COMPARISON_COL))
+
+
+def sorgen_unsicherheit(df, state):
+    """Bootstrap-KI der Sorgen je Nutzungskategorie und Permutationstest Wenig vs. Viel."""
+    def berechnen():
+        # Aus den Häufigkeiten der (gecachten) Verteilung, nicht aus den Zeilen
+        vt = verteilung_nutzung(df, state)
+        counts = dict(zip(vt.gruppen, vt.counts_for(WORRIES_COL)))
+        leer = np.zeros(len(bootstrap.WERTE), dtype=np.int64)
+        return {
+            "ki": bootstrap.group_cis(vt, WORRIES_COL),
+            "p": bootstrap.permutation_test(counts.get("Wenig", leer), counts.get("Viel", leer)),
+        }
+    return cached("bootstrap_sorgen", df, state, berechnen)
+
+
+def plattform_daten(df, state):
+    """Plattform-Matrix und Depressions-Werte der Filter-Auswahl."""
+    auswahl = filter_positions(df, state)
+    return load_platforms().iloc[auswahl], df[DEPRESSION_COL].iloc[auswahl]
+
+
+def battle_unsicherheit(df, state, app1, app2):
+    """Bootstrap-KI je App + Permutationstest (nur-App-1 vs. nur-App-2, pro Filter & App-Paar gecacht)."""
+    def berechnen():
+        matrix, dep_werte = plattform_daten(df, state)
+        werte = dep_werte.to_numpy(dtype=float)
+        counts_1 = bootstrap.zaehlen(werte[matrix[app1].to_numpy()])
+        counts_2 = bootstrap.zaehlen(werte[matrix[app2].to_numpy()])
+        nur_1, nur_2 = (bootstrap.zaehlen(w) for w in plattformen.exklusiv(matrix, dep_werte, app1, app2))
+        return {
+            "ki_1": bootstrap.mean_ci(counts_1)[1:3],
+            "ki_2": bootstrap.mean_ci(counts_2)[1:3],
+            "p": bootstrap.permutation_test(nur_1, nur_2),
+            "n_test": (int(nur_1.sum()), int(nur_2.sum())),
+        }
+    return cached(f"bootstrap_battle:{app1}:{app2}", df, state, berechnen)
+
+
+def korrelation(df, state, methode="pearson"):
+    # Aus den 5×5-Kontingenztafeln aller Fragen-Paare (siehe analyse/korrelation.py)
+    return cached(f"korrelation:{methode}", df, state,
+                  lambda: diagramme.korrelationsmatrix(filtered_frame(df, state), methode))
+
+
+def plattform_paare(df, state):
+    # Alle App-Paare in einem Matrixprodukt statt 36 Einzelvergleichen
+    return cached("plattform_paare", df, state, lambda: plattformen.all_pairs(*plattform_daten(df, state)))
+
+
+def kohorten_vergleich(df, a, b):
+    """Vergleich zweier Kohorten; hängt nicht von der Sidebar ab, daher eigener Schlüssel."""
+    def berechnen():
+        perf.cache_miss()
+        return kohorten.vergleich(load_kohorten(), a, b)
+
+    with perf.stage("cache:kohorten", cached=True):
+        return filter_cache().get_or_compute(("kohorten", df.attrs.get("fingerprint"), a.key(), b.key()), berechnen)
+
+
+# --- DIAGRAMM-CACHE ---
+RENDER_CACHE_BYTES = 64 * 1024 ** 2
+
+
+@st.cache_resource
+def render_cache():
+    return LRUCache(RENDER_CACHE_BYTES)
+
+
+def _theme():
+    kontext = getattr(st.context, "theme", None)
+    return getattr(kontext, "type", None) or st.get_option("theme.base") or "light"
+
+
+def figure_png(chart_id, df, state, draw, *args, variante=None, theme=None):
+    """PNG von ``draw(*args)`` aus dem Render-Cache; gerendert wird nur, wenn es neu ist.
+
+    Der Cache-Schlüssel besteht aus Diagramm-ID, ``variante`` (z.B. gewähltes
+    Thema), Datensatz, Filter-Zustand und Theme. ``args`` gehören nicht dazu:
+    Sie müssen sich aus diesen Teilen ergeben, sonst gehört die Auswahl in ``variante``.
+    Hängt ein Diagramm nicht vom Sidebar-Filter ab, ist ``state`` ``None``.
+    """
+    key = (chart_id, variante, df.attrs.get("fingerprint"), state and state.key(), theme or _theme())
+
+    def zeichnen():
+        perf.cache_miss()
+        return render.render_png(draw, *args)
+
+    return render_cache().get_or_compute(key, zeichnen)
+
+
+def show_figure(chart_id, df, state, draw, *args, variante=None):
+    """Diagramm anzeigen (siehe ``figure_png``)."""
+    with perf.stage(f"render:{chart_id}", cached=True):
+        st.image(figure_png(chart_id, df, state, draw, *args, variante=variante), use_container_width=True)
+
+
+# --- PERFORMANCE-PANEL (opt-in: SMA_PERF=1 oder ?perf=1) ---
+PERF_HISTORY = 20
+
+
+def perf_start(seite):
+    perf.stop()  # Reste eines per st.stop() abgebrochenen Laufs verwerfen
+    if perf.enabled() or st.query_params.get("perf") == "1":
+        perf.start(seite)
+
+
+def perf_panel():
+    """Lauf abschließen, ins JSONL-Log schreiben und die letzten Reruns anzeigen."""
+    lauf = perf.stop()
+    if lauf is None:
+        return
+    perf.write_jsonl(lauf)
+    verlauf = st.session_state.setdefault("_perf_verlauf", [])
+    verlauf.append(lauf.als_dict())
+    del verlauf[:-PERF_HISTORY]
+
+    with st.sidebar.expander("Performance"):
+        st.caption(f"Letzte {len(verlauf)} Reruns (neueste zuerst), Log: {perf.LOG_PATH}")
+        st.dataframe(
+            [{"Seite": eintrag["seite"], "Zeit": eintrag["zeitpunkt"], "Gesamt (ms)": round(eintrag["gesamt_ms"], 1)}
+             for eintrag in reversed(verlauf)],
+            hide_index=True, use_container_width=True,
+        )
+        st.write("**Letzter Rerun**")
+        st.dataframe(
+            [{"Abschnitt": s["name"], "ms": round(s["wall_ms"], 1), "Peak (KB)": round(s["peak_kb"], 1),
+              "Zeilen": s["rows"], "Cache": s["cache"]} for s in verlauf[-1]["stufen"]],
+            hide_index=True, use_container_width=True,
+        )
+
+
+# --- PAGINIERTE TABELLE ---
+SEITENGROESSEN = [25, 50, 100, 250]
+
+
+def paginated_dataframe(df, state, key):
+    """Nur die sichtbare Seite an den Browser schicken; Suche/Sortierung serverseitig."""
+    alle = list(df.columns)
+    c_spalten, c_suche = st.columns([2, 1])
+    spalten = c_spalten.multiselect("Spalten", alle, default=alle, key=f"{key}_spalten")
+    suche = c_suche.text_input("Suche", key=f"{key}_suche", placeholder="z.B. Instagram")
+    c_sort, c_richtung, c_groesse = st.columns([2, 1, 1])
+    sortierung = c_sort.selectbox("Sortieren nach", ["—"] + alle, key=f"{key}_sort")
+    absteigend = c_richtung.toggle("Absteigend", key=f"{key}_desc")
+    groesse = c_groesse.selectbox("Zeilen pro Seite", SEITENGROESSEN, index=1, key=f"{key}_groesse")
+
+    if not spalten:
+        st.info("Bitte mindestens eine Spalte wählen.")
+        return
+
+    ansicht = tabelle.Ansicht(tuple(spalten), suche, None if sortierung == "—" else sortierung, absteigend, groesse)
+    positionen = cached(f"tabelle:{ansicht.spalten}:{ansicht.suche}:{ansicht.sortierung}:{ansicht.absteigend}",
+                        df, state, lambda: tabelle.reihenfolge(df, ansicht, filter_positions(df, state)))
+
+    seiten = tabelle.seitenzahl(len(positionen), groesse)
+    nummer = st.number_input(f"Seite (von {seiten})", 1, seiten, 1, key=f"{key}_seite")
+    nummer = min(nummer, seiten)
+    start = (nummer - 1) * groesse
+    st.caption(f"Zeilen {min(start + 1, len(positionen))}–{min(start + groesse, len(positionen))} "
+               f"von {len(positionen)}")
+    st.dataframe(tabelle.seite(df, positionen, ansicht, nummer), use_container_width=True)
+
+
+# --- VORWÄRMEN BEIM SERVERSTART ---
+# Streamlit hat keinen Start-Hook: Der erste Skriptlauf im Prozess startet einen Hintergrund-Thread,
+# der die Standard-Ansicht beider Seiten in die Caches rechnet.
+def _vorwaerm_schritte():
+    """(Beschreibung, Funktion) für Daten, Standard-Filter, Tabellen und Diagramme."""
+    df = load_data()
+    if df is None:
+        return []
+    state = FilterState.default(df)
+    app1, app2 = plattformen.APPS[:2]  # Vorauswahl im Battle-Modus
+    thema = next(iter(diagramme.themen_dict))  # Vorauswahl der eigenen Analyse
+
+    def bild(chart_id, draw, argumente, variante=None):
+        # Ohne Browser-Session gibt es kein Theme -> Standard-Theme des Servers
+        return lambda: figure_png(chart_id, df, state, draw, *argumente(), variante=variante,
+                                  theme=st.get_option("theme.base") or "light")
+
+    return [
+        ("Würfel", load_cube),
+        ("Plattform-Matrix", load_platforms),
+        ("Zeilen-Fingerprints", load_fingerprints),
+        ("Qualitätsbericht", load_quality_report),
+        ("Bereinigungsbericht", load_cleaning_report),
+        ("Standard-Filter", lambda: (auswertung(df, state), qualitaets_check(df, state), spalten_info(df, state))),
+        ("Verteilungen", lambda: (verteilung_nutzung(df, state), verteilung_vergleich(df, state))),
+        ("Bootstrap", lambda: (sorgen_unsicherheit(df, state), battle_unsicherheit(df, state, app1, app2))),
+        ("App-Paare", lambda: plattform_paare(df, state)),
+        ("Diagramm 1", bild("fig1", diagramme.depression_nach_nutzung, lambda: (verteilung_nutzung(df, state),))),
+        ("Diagramm 2", bild("fig2", diagramme.depression_nach_vergleich, lambda: (verteilung_vergleich(df, state),))),
+        ("Diagramm 3", bild("fig3", diagramme.sorgen_nach_nutzung,
+                            lambda: (verteilung_nutzung(df, state), sorgen_unsicherheit(df, state)["ki"]))),
+        ("Diagramm 4", bild("fig4", diagramme.schlaf_nach_nutzung, lambda: (verteilung_nutzung(df, state),))),
+        ("Eigene Analyse", bild("fig_custom", diagramme.eigene_analyse,
+                                lambda: (verteilung_nutzung(df, state), thema), variante=thema)),
+        ("Korrelationen", bild("fig_corr", diagramme.korrelation,
+                               lambda: (korrelation(df, state), True, bootstrap.ALPHA), variante=("pearson", True))),
+    ]
+
+
+def _vorwaermen(status):
+    start = time.perf_counter()
+    try:
+        status["schritt"] = "Daten"
+        schritte = _vorwaerm_schritte()
+        status["gesamt"] = len(schritte)
+        for name, schritt in schritte:
+            status["schritt"] = name
+            schritt()
+            status["fertig"] += 1
+    except Exception as fehler:  # Vorwärmen darf den Server nie stören; die Seiten rechnen dann selbst
+        status["fehler"] = repr(fehler)
+    status["dauer"] = time.perf_counter() - start
+    status["laeuft"] = False
+
+
+@st.cache_resource
+def start_warmup():
+    """Einmal pro Server-Prozess: Caches im Hintergrund vorwärmen."""
+    status = {"laeuft": True, "schritt": None, "fertig": 0, "gesamt": None, "fehler": None, "dauer": None}
+    thread = threading.Thread(target=_vorwaermen, args=(status,), name="cache-vorwaermen", daemon=True)
+    # Kontext des startenden Laufs mitgeben, sonst warnen die st.cache_*-Aufrufe im Thread
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return status
+
+
+def warmup_status():
+    """Kleiner Status in der Sidebar, solange bzw. nachdem vorgewärmt wurde."""
+    status = start_warmup()
+    if status["laeuft"]:
+        gesamt = status["gesamt"] or "?"
+        st.sidebar.caption(f"⏳ Caches werden vorgewärmt: {status['schritt']} ({status['fertig']}/{gesamt})")
+    elif status["fehler"]:
+        st.sidebar.caption(f"⚠️ Vorwärmen abgebrochen: {status['fehler']}")
+    else:
+        st.sidebar.caption(f"✅ Caches vorgewärmt ({status['fertig']} Schritte, {status['dauer']:.1f} s)")
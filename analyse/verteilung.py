@@ -0,0 +1,96 @@
+"""Verteilungs-Engine für die Likert-Diagramme.
+
+Alle Likert-Fragen haben nur die Werte 1-5. Statt jede Zeile an Seaborn zu
+geben, wird einmal eine Häufigkeitstabelle Gruppe × Frage × Wert berechnet
+(ein einziger ``bincount`` über alle Zeilen). Boxplot-Kennzahlen, Mittelwerte
+und Balkenbeschriftungen werden daraus abgeleitet, der Zeichenaufwand hängt
+also nur noch von der Zahl der Kategorien ab.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analyse.schema import LIKERT_COLS, LIKERT_VALUES
+from analyse.statistik import quantile_from_counts
+
+WHIS = 1.5  # Wie matplotlib/seaborn: Whisker bis 1,5 × IQR
+
+
+@dataclass
+class Verteilung:
+    """Häufigkeiten ``counts[gruppe, frage, wert - 1]``."""
+
+    gruppen: list
+    columns: list
+    counts: np.ndarray
+
+    def counts_for(self, col):
+        return self.counts[:, self.columns.index(col), :]
+
+    def n(self, col):
+        return self.counts_for(col).sum(axis=1)
+
+    def means(self, col):
+        c = self.counts_for(col)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(c @ np.asarray(LIKERT_VALUES) / c.sum(axis=1), index=self.gruppen)
+
+    def box_stats(self, col):
+        """Kennzahlen je Gruppe im Format von ``Axes.bxp`` (leere Gruppen = ``None``)."""
+        return [_box(c, gruppe) for c, gruppe in zip(self.counts_for(col), self.gruppen)]
+
+
+def _box(counts, label):
+    if counts.sum() == 0:
+        return None
+    werte = np.asarray(LIKERT_VALUES, dtype=float)
+    vorhanden = werte[counts > 0]
+    q1 = quantile_from_counts(counts, werte, 0.25)
+    med = quantile_from_counts(counts, werte, 0.5)
+    q3 = quantile_from_counts(counts, werte, 0.75)
+    iqr = q3 - q1
+    innen_hi = vorhanden[vorhanden <= q3 + WHIS * iqr]
+    innen_lo = vorhanden[vorhanden >= q1 - WHIS * iqr]
+    whishi = innen_hi.max() if len(innen_hi) else q3
+    whislo = innen_lo.min() if len(innen_lo) else q1
+    return {
+        "label": str(label),
+        "q1": q1, "med": med, "q3": q3,
+        "whislo": whislo, "whishi": whishi,
+        "mean": counts @ werte / counts.sum(),
+        # Jeder Ausreißer-Wert nur einmal (gleiche Werte liegen ohnehin übereinander)
+        "fliers": vorhanden[(vorhanden < whislo) | (vorhanden > whishi)],
+    }
+
+
+def _gruppen(spalte):
+    if isinstance(spalte.dtype, pd.CategoricalDtype):
+        return list(spalte.cat.categories), spalte.cat.codes.to_numpy(dtype=np.int64)
+    werte = pd.to_numeric(spalte, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    gruppen = np.unique(werte[~np.isnan(werte)])
+    codes = np.searchsorted(gruppen, np.nan_to_num(werte, nan=-np.inf))
+    codes[np.isnan(werte)] = -1
+    return [int(g) if float(g).is_integer() else g for g in gruppen], codes.astype(np.int64)
+
+
+def haeufigkeiten(zelle, werte, n_zellen):
+    """Häufigkeiten der Likert-Werte, Form (``n_zellen`` × Fragen × Werte).
+
+    ``zelle`` ist der Zellen-Index jeder Zeile (negativ = nicht zählen),
+    ``werte`` die Antworten als Float-Matrix Zeilen × Fragen. Auch der Würfel
+    und die Kohorten-Tabelle zählen hierüber.
+    """
+    n_k, n_v = werte.shape[1], len(LIKERT_VALUES)
+    gueltig = (zelle >= 0)[:, None] & np.isin(werte, LIKERT_VALUES)
+    # Alle Fragen in einem bincount: Index = (Zelle, Frage, Wert)
+    flat = (zelle[:, None] * n_k + np.arange(n_k)) * n_v + (np.nan_to_num(werte).astype(np.int64) - 1)
+    return np.bincount(flat[gueltig], minlength=n_zellen * n_k * n_v).reshape(n_zellen, n_k, n_v)
+
+
+def likert_counts(df, by, columns=None):
+    """Häufigkeiten aller Likert-Fragen je Gruppe von ``by`` in einem Durchlauf."""
+    columns = [c for c in (columns or LIKERT_COLS) if c in df.columns]
+    gruppen, codes = _gruppen(df[by])
+    werte = df[columns].to_numpy(dtype=float, na_value=np.nan)
+    return Verteilung(gruppen, columns, haeufigkeiten(codes, werte, len(gruppen)))
@@ -0,0 +1 @@
+"""Headless Benchmarks für die Pipeline Laden → Filtern → Aggregieren → Rendern."""
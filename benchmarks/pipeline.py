@@ -0,0 +1,161 @@
+"""Zeitmessung der einzelnen Pipeline-Stufen auf synthetischen Datensätzen.
+
+Aufruf::
+
+    python -m benchmarks.pipeline                      # 1k, 100k, 1M, 10M Zeilen
+    python -m benchmarks.pipeline --rows 1000 100000 --output bench_results.json
+
+Pro Größe wird eine CSV erzeugt und jede Stufe ``--repeat`` Mal gemessen.
+Das Ergebnis ist eine JSON-Datei (Metadaten + eine Zeile pro Größe und
+Stufe), die sich zwischen Versionen vergleichen lässt.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analyse import cube, daten, diagramme, plattformen, render, verteilung
+from analyse.filter import FilterState
+from analyse.schema import COMPARISON_COL, DEPRESSION_COL, USAGE_COL
+from benchmarks import synthetisch
+
+STANDARD_ROWS = [1_000, 100_000, 1_000_000, 10_000_000]
+
+
+def _messen(funktion, repeat):
+    zeiten = []
+    ergebnis = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ergebnis = funktion()
+        zeiten.append(time.perf_counter() - start)
+    return zeiten, ergebnis
+
+
+def _typischer_filter(df):
+    """Eine realistische Auswahl: ein Beruf abgewählt, Alter eingeschränkt."""
+    standard = FilterState.default(df)
+    return FilterState(standard.berufe[:-1] or standard.berufe, standard.zeiten, (18, 30))
+
+
+def stufen(df, filter_state):
+    """Die gemessenen Stufen als (Name, Funktion) in Pipeline-Reihenfolge."""
+    df_filtered = filter_state.apply(df)
+    matrix = plattformen.platform_matrix(df)
+    wuerfel = cube.AggregateCube(df)
+    vt_nutzung = verteilung.likert_counts(df_filtered, USAGE_COL)
+    vt_vergleich = verteilung.likert_counts(df_filtered, COMPARISON_COL)
+    auswahl = next(iter(diagramme.themen_dict))
+
+    return [
+        ("filter", lambda: filter_state.apply(df)),
+        ("describe", lambda: df_filtered.describe()),
+        ("corr", lambda: diagramme.korrelationsmatrix(df_filtered)),
+        ("cube_build", lambda: cube.AggregateCube(df)),
+        ("cube_query", lambda: wuerfel.query(filter_state.berufe, filter_state.zeiten, filter_state.alter)),
+        ("platform_matrix", lambda: plattformen.platform_matrix(df)),
+        ("battle", lambda: plattformen.battle(matrix.loc[df_filtered.index], df_filtered[DEPRESSION_COL], "Instagram", "TikTok")),
+        ("battle_all_pairs", lambda: plattformen.all_pairs(matrix.loc[df_filtered.index], df_filtered[DEPRESSION_COL])),
+        ("likert_counts", lambda: verteilung.likert_counts(df_filtered, USAGE_COL)),
+        ("render_fig1", lambda: render.render_png(diagramme.depression_nach_nutzung, vt_nutzung)),
+        ("render_fig2", lambda: render.render_png(diagramme.depression_nach_vergleich, vt_vergleich)),
+        ("render_fig3", lambda: render.render_png(diagramme.sorgen_nach_nutzung, vt_nutzung)),
+        ("render_fig4", lambda: render.render_png(diagramme.schlaf_nach_nutzung, vt_nutzung)),
+        ("render_fig_custom", lambda: render.render_png(diagramme.eigene_analyse, vt_nutzung, auswahl)),
+        ("render_fig_corr", lambda: render.render_png(diagramme.korrelation, diagramme.korrelationsmatrix(df_filtered))),
+    ]
+
+
+def benchmark(rows, repeat=3, seed=0):
+    """Alle Stufen für einen Datensatz mit ``rows`` Zeilen messen."""
+    ergebnisse = []
+
+    def eintragen(stufe, zeiten, zeilen):
+        ergebnisse.append({
+            "rows": rows,
+            "stage": stufe,
+            "rows_processed": int(zeilen),
+            "repeat": len(zeiten),
+            "seconds_min": min(zeiten),
+            "seconds_median": statistics.median(zeiten),
+        })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = synthetisch.write_csv(rows, Path(tmp) / "survey.csv", seed=seed)
+        cache_dir = Path(tmp) / "cache"
+
+        # Kaltstart: CSV parsen + bereinigen + Arrow-Cache schreiben (jedes Mal frischer Cache)
+        kalt = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            daten.load_data(csv, cache_dir=Path(tmp) / f"kalt-{i}", wellen_dir=None)
+            kalt.append(time.perf_counter() - start)
+        eintragen("load_data_cold", kalt, rows)
+
+        # Nur die synthetische CSV, ohne die im Repo eingespielten Wellen
+        daten.load_data(csv, cache_dir=cache_dir, wellen_dir=None)
+        zeiten, df = _messen(lambda: daten.load_data(csv, cache_dir=cache_dir, wellen_dir=None), repeat)
+        eintragen("load_data_warm", zeiten, rows)
+
+        filter_state = _typischer_filter(df)
+        n_gefiltert = int(np.count_nonzero(filter_state.mask(df)))
+        for name, funktion in stufen(df, filter_state):
+            zeiten, _ = _messen(funktion, repeat)
+            voll = name in ("cube_build", "platform_matrix")
+            eintragen(name, zeiten, len(df) if voll else n_gefiltert)
+    return ergebnisse
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=daten.BASIS_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=STANDARD_ROWS, help="Datensatzgrößen")
+    parser.add_argument("--repeat", type=int, default=3, help="Messungen pro Stufe")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    args = parser.parse_args(argv)
+
+    ergebnisse = []
+    for rows in args.rows:
+        print(f"{rows:>12,} Zeilen ...", flush=True)
+        zeilen = benchmark(rows, repeat=args.repeat, seed=args.seed)
+        for z in zeilen:
+            print(f"    {z['stage']:<20} {z['seconds_median'] * 1000:10.1f} ms")
+        ergebnisse.extend(zeilen)
+
+    bericht = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": ergebnisse,
+    }
+    args.output.write_text(json.dumps(bericht, indent=2))
+    print(f"Ergebnisse gespeichert in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
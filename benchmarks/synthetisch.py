@@ -0,0 +1,31 @@
+"""Synthetische Datensätze mit Schema und Verteilungen der echten Umfrage.
+
+Es werden ganze Zeilen aus ``data/social_media_cleaned.csv`` mit Zurücklegen
+gezogen. Damit entsprechen die Randverteilungen (bis auf den Zufall der
+Stichprobe) dem Original, und die Zusammenhänge zwischen den Spalten bleiben
+erhalten. Damit die CSV-Zeilen keine reinen Kopien sind, bekommt jede Zeile
+einen eigenen ``Timestamp`` wie im Rohexport; die Spalte fließt in keine
+Auswertung ein und wird bei der Bereinigung entfernt.
+"""
+import numpy as np
+import pandas as pd
+
+from analyse.daten import DATA_PATH
+
+START = pd.Timestamp("2023-01-01")
+
+
+def generate(rows, seed=0, vorlage=DATA_PATH):
+    """DataFrame mit ``rows`` Zeilen im Rohformat der CSV erzeugen."""
+    basis = pd.read_csv(vorlage)
+    rng = np.random.default_rng(seed)
+    df = basis.iloc[rng.integers(0, len(basis), rows)].reset_index(drop=True)
+    # Sekundenabstände mit Zufallsanteil: eindeutig und aufsteigend
+    sekunden = np.cumsum(rng.integers(1, 60, rows))
+    df.insert(0, "Timestamp", (START + pd.to_timedelta(sekunden, unit="s")).strftime("%Y/%m/%d %H:%M:%S"))
+    return df
+
+
+def write_csv(rows, path, seed=0):
+    generate(rows, seed=seed).to_csv(path, index=False)
+    return path
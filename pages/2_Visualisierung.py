@@ -1,166 +1,94 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go # Für das Radar Chart
+
+from analyse import bootstrap, diagramme, korrelation, perf, plattformen, ui
+from analyse.kohorten import Kohorte
+from analyse.ui import (battle_unsicherheit, cache_status, filter_positions, load_data, load_kohorten, perf_panel,
+                        perf_start, plattform_daten, plattform_paare, show_figure, sidebar_filter, sorgen_unsicherheit,
+                        warmup_status)
 
 st.set_page_config(page_title="Visualisierung", layout="wide", page_icon="")
+perf_start("visualisierung")
+warmup_status()
 
 st.title("Visualisierungen")
 
 # --- DATEN LADEN & FILTERN (Muss hier wiederholt werden für die Interaktion) ---
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/social_media_cleaned.csv')
-    uebersetzung = {
-        "University Student": "Student (Uni)", "School Student": "Schüler",
-        "Salaried Worker": "Angestellter", "Retired": "Rentner"
-    }
-    df['4. Occupation Status'] = df['4. Occupation Status'].replace(uebersetzung)
-    return df
-
 df = load_data()
+if df is None:
+    st.error("⚠️ Datei 'social_media_cleaned.csv' nicht gefunden!")
+    st.stop()
+
+# Sidebar Filter (gleicher Zustand wie auf Seite 1)
+filter_state = sidebar_filter(df, "Filter für Diagramme", ["Berufsstatus:", "Nutzungsdauer:", "Alter:"])
+with perf.stage("filter", rows=len(df)):
+    auswahl = filter_positions(df, filter_state)
 
-# Sidebar Filter (Kopie von Seite 1, damit es konsistent ist)
-st.sidebar.header("Filter für Diagramme")
-beruf_filter = st.sidebar.multiselect("Berufsstatus:", df['4. Occupation Status'].unique(), default=df['4. Occupation Status'].unique())
-zeit_filter = st.sidebar.multiselect("Nutzungsdauer:", df['Nutzungszeit_Kategorie'].unique(), default=df['Nutzungszeit_Kategorie'].unique())
-min_age, max_age = int(df['1. What is your age?'].min()), int(df['1. What is your age?'].max())
-age_filter = st.sidebar.slider("Alter:", min_age, max_age, (min_age, max_age))
-
-df_filtered = df[
-    (df['4. Occupation Status'].isin(beruf_filter)) &
-    (df['Nutzungszeit_Kategorie'].isin(zeit_filter)) &
-    (df['1. What is your age?'] >= age_filter[0]) &
-    (df['1. What is your age?'] <= age_filter[1])
-]
-
-if len(df_filtered) == 0:
+if len(auswahl) == 0:
     st.warning("Keine Daten verfügbar.")
     st.stop()
 
-# Konfiguration für Plots
-meine_farben = {"Wenig": "gold", "Mittel": "orange", "Viel": "red"}
-reihenfolge = ["Wenig", "Mittel", "Viel"]
+cache_status()
+
+
+def verteilung_nutzung():
+    return ui.verteilung_nutzung(df, filter_state)
+
 
-# --- TABS ---
-tab1, tab2, tab4, tab5, tab3 = st.tabs([
-    "Haupt-Analyse", "Schlaf & Sorgen", " Profil-Vergleich", " Plattform-Check", " Korrelationen"
-])
+def verteilung_vergleich():
+    return ui.verteilung_vergleich(df, filter_state)
 
+
+# Diagramme kommen aus dem Render-Cache und werden nur bei neuen Filtern neu gezeichnet
 # TAB 1: Haupt-Analyse
-with tab1:
+def haupt_analyse():
     st.header("Einfluss auf Depression")
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("A) Nutzungsdauer")
-        fig1, ax1 = plt.subplots(figsize=(5, 5))
-        sns.boxplot(data=df_filtered, x='Nutzungszeit_Kategorie', y='18. How often do you feel depressed or down?', order=reihenfolge, palette=meine_farben, ax=ax1)
-        ax1.set_xlabel("Nutzungsdauer"); ax1.set_ylabel("Depression")
-        st.pyplot(fig1, use_container_width=True)
+        show_figure("fig1", df, filter_state, diagramme.depression_nach_nutzung, verteilung_nutzung())
     with col2:
         st.subheader("B) Sozialer Vergleich")
-        fig2, ax2 = plt.subplots(figsize=(5, 5))
-        sns.boxplot(data=df_filtered, x='15. On a scale of 1-5, how often do you compare yourself to other successful people through the use of social media?', y='18. How often do you feel depressed or down?', palette='Blues', ax=ax2)
-        ax2.set_xlabel("Vergleichshäufigkeit"); ax2.set_ylabel("Depression")
-        st.pyplot(fig2, use_container_width=True)
+        show_figure("fig2", df, filter_state, diagramme.depression_nach_vergleich, verteilung_vergleich())
+
 
 # TAB 2: Schlaf & Sorgen
-with tab2:
+def schlaf_und_sorgen():
     st.header("Alltag & Schlaf")
     col3, col4 = st.columns(2)
     with col3:
         st.subheader("C) Sorgen")
-        fig3, ax3 = plt.subplots(figsize=(5, 5))
-
-        sns.barplot(
-            data=df_filtered,
-            x='Nutzungszeit_Kategorie',
-            y='13. On a scale of 1 to 5, how much are you bothered by worries?',
-            order=reihenfolge,
-            palette=meine_farben,
-            ax=ax3,
-            errorbar=None  # Wichtig, damit keine schwarzen Linien stören
-        )
-
-        # --- HIER IST DER FIX ---
-        # Wir gehen durch ALLE Container (Balken) durch, nicht nur den ersten [0]
-        for container in ax3.containers:
-            ax3.bar_label(container, fmt='%.2f')
-
-        ax3.set_ylim(0, 5.5)
-        ax3.set_xlabel("Nutzungsdauer")
-        ax3.set_ylabel("Sorgen (1-5)")
-
-        st.pyplot(fig3, use_container_width=True)
+        sorgen = sorgen_unsicherheit(df, filter_state)
+        show_figure("fig3", df, filter_state, diagramme.sorgen_nach_nutzung, verteilung_nutzung(), sorgen["ki"])
+        p_text = f"p = {sorgen['p']:.3f}" if sorgen["p"] == sorgen["p"] else "nicht berechenbar"
+        st.caption(f"Fehlerbalken: 95%-Bootstrap-KI ({bootstrap.BOOTSTRAP_B} Resamples). "
+                   f"Permutationstest Wenig vs. Viel: {p_text}")
     with col4:
         st.subheader("D) Schlafprobleme")
-        fig4, ax4 = plt.subplots(figsize=(5, 5))
-
-        sns.boxplot(
-            data=df_filtered,
-            x='Nutzungszeit_Kategorie',
-            y='20. On a scale of 1 to 5, how often do you face issues regarding sleep?',
-            order=reihenfolge,
-            palette=meine_farben,
-            ax=ax4,
-            # TRICK: Zeigt den Durchschnitt als weißen Diamanten an
-            showmeans=True,
-            meanprops={"marker": "D", "markerfacecolor": "white", "markeredgecolor": "black"}
-        )
-
-        # Achsen ordentlich beschriften
-        ax4.set_xlabel("Tägliche Nutzungsdauer")
-        ax4.set_ylabel("Häufigkeit Schlafprobleme (1-5)")
-        ax4.set_ylim(0, 5.5)
+        show_figure("fig4", df, filter_state, diagramme.schlaf_nach_nutzung, verteilung_nutzung())
 
-        st.pyplot(fig4, use_container_width=True)
 
 # --- TAB 4: Interaktive Analyse (Schlaf entfernt!) ---
-with tab4:
+def profil_vergleich():
     st.header(" Eigene Analyse erstellen")
     st.info(" **Anleitung:** Wähle unten ein Thema (z.B. Konzentration) aus. Das Diagramm zeigt dir dann automatisch, ob Viel-Nutzer schlechtere Werte haben als Wenig-Nutzer.")
 
-    themen_dict = {
-        "Konzentrationsmangel": "14. Do you find it difficult to concentrate on things?",
-        "Ablenkung": "12. On a scale of 1 to 5, how easily distracted are you?",
-        "Validierung suchen": "17. How often do you look to seek validation from features of social media?",
-        "Interesse-Schwankung": "19. On a scale of 1 to 5, how frequently does your interest in daily activities fluctuate?"
-        # Schlafprobleme entfernt, da schon in Tab 2!
-    }
-
-    auswahl = st.selectbox("Welches Thema möchtest du untersuchen?", list(themen_dict.keys()))
-    spalte_y = themen_dict[auswahl]
-
-    if len(df_filtered) > 0:
-        fig_custom, ax_custom = plt.subplots(figsize=(8, 5))
-        sns.boxplot(
-            data=df_filtered,
-            x='Nutzungszeit_Kategorie',
-            y=spalte_y,
-            order=reihenfolge,
-            hue='Nutzungszeit_Kategorie', legend=False,
-            palette=meine_farben,
-            ax=ax_custom
-        )
-        ax_custom.set_title(f"Analyse: {auswahl} vs. Nutzungsdauer")
-        ax_custom.set_ylabel("Bewertung (1-5)")
-        ax_custom.set_xlabel("Tägliche Nutzungsdauer")
-        ax_custom.set_ylim(0.5, 5.5)
+    thema = st.selectbox("Welches Thema möchtest du untersuchen?", list(diagramme.themen_dict.keys()))
+
+    # Leere Filter-Auswahl wurde oben schon abgefangen
+    show_figure("fig_custom", df, filter_state, diagramme.eigene_analyse, verteilung_nutzung(), thema, variante=thema)
 
-        st.pyplot(fig_custom, use_container_width=True)
-    else:
-        st.warning("Keine Daten verfügbar.")
 
-# --- TAB 5: Der "Battle-Modus" (App vs. App) - INTERAKTIV ---
 # --- TAB 5: Der "Battle-Modus" (App vs. App) - INTERAKTIV aber FIXIERT ---
-with tab5:
+def plattform_check():
+    # Plotly wird erst geladen, wenn jemand den Battle-Modus öffnet
+    import plotly.express as px
+
     st.header("🥊 App-Battle: Vergleich zwei Plattformen")
     # Text leicht angepasst, da man nicht mehr zoomen kann
     st.markdown("Wähle zwei Apps aus. Fahre mit der Maus über die Balken, um Details zu sehen.")
 
-    apps = ["Instagram", "TikTok", "YouTube", "Facebook", "Twitter", "Reddit", "Discord", "Snapchat", "Pinterest"]
+    apps = plattformen.APPS
 
     # Zwei Spalten für die Auswahl
     c_select1, c_select2 = st.columns(2)
@@ -172,30 +100,33 @@ with tab5:
 
     if app1 == app2:
         st.warning("Bitte wähle zwei unterschiedliche Apps aus!")
-        st.stop()
-
-    col_platforms = '7. What social media platforms do you commonly use?'
-    df_clean = df_filtered.dropna(subset=[col_platforms])
+        return
 
     # --- DATEN FILTERN ---
-    mask_1 = df_clean[col_platforms].str.contains(app1, case=False, na=False)
-    df_1 = df_clean[mask_1]
+    # Plattform-Matrix wurde beim Laden einmal geparst -> hier nur Spalten nachschlagen
+    platform_matrix, dep_werte = plattform_daten(df, filter_state)
+    battle = plattformen.battle(platform_matrix, dep_werte, app1, app2)
+    (n_1, dep_1), (n_2, dep_2) = battle[app1], battle[app2]
 
-    mask_2 = df_clean[col_platforms].str.contains(app2, case=False, na=False)
-    df_2 = df_clean[mask_2]
+    if n_1 > 0 and n_2 > 0:
+        stats = battle_unsicherheit(df, filter_state, app1, app2)
 
-    if len(df_1) > 0 and len(df_2) > 0:
         st.divider()
 
-        dep_1 = df_1['18. How often do you feel depressed or down?'].mean()
-        dep_2 = df_2['18. How often do you feel depressed or down?'].mean()
-
         # --- METRIKEN (KPIs) ---
         c_m1, c_m2, c_m3, c_m4 = st.columns(4)
-        c_m1.metric(f"Nutzer ({app1})", len(df_1))
+        c_m1.metric(f"Nutzer ({app1})", n_1)
         c_m2.metric(f"Ø Depression ({app1})", f"{dep_1:.2f}")
-        c_m3.metric(f"Nutzer ({app2})", len(df_2))
+        c_m3.metric(f"Nutzer ({app2})", n_2)
         c_m4.metric(f"Ø Depression ({app2})", f"{dep_2:.2f}", delta=f"{dep_2 - dep_1:.2f}", delta_color="inverse")
+        c_m2.caption(f"95%-KI: {stats['ki_1'][0]:.2f} – {stats['ki_1'][1]:.2f}")
+        c_m4.caption(f"95%-KI: {stats['ki_2'][0]:.2f} – {stats['ki_2'][1]:.2f}")
+        n_nur_1, n_nur_2 = stats["n_test"]
+        p_text = f"p = {stats['p']:.3f}" if n_nur_1 and n_nur_2 else "nicht berechenbar"
+        st.caption(f"Permutationstest ({bootstrap.BOOTSTRAP_B} Permutationen): {p_text}. "
+                   f"Nutzer beider Apps zählen bei Kennzahlen und KI in beiden Gruppen. Der Test setzt getrennte "
+                   f"Gruppen voraus und vergleicht deshalb nur Personen, die ausschließlich {app1} ({n_nur_1}) "
+                   f"bzw. ausschließlich {app2} ({n_nur_2}) von beiden nutzen.")
 
         st.divider()
 
@@ -206,7 +137,9 @@ with tab5:
         plot_data = pd.DataFrame({
             'Plattform': [app1, app2],
             'Depression Score': [dep_1, dep_2],
-            'Anzahl Nutzer': [len(df_1), len(df_2)]
+            'Anzahl Nutzer': [n_1, n_2],
+            'KI oben': [stats['ki_1'][1] - dep_1, stats['ki_2'][1] - dep_2],
+            'KI unten': [dep_1 - stats['ki_1'][0], dep_2 - stats['ki_2'][0]]
         })
 
         # Farben: App 1 = Rot, App 2 = Blau
@@ -219,7 +152,9 @@ with tab5:
             color='Plattform',
             color_discrete_map=farben_map,
             text_auto='.2f',
-            hover_data={'Plattform': False, 'Depression Score': ':.2f', 'Anzahl Nutzer': True}
+            error_y='KI oben', error_y_minus='KI unten',
+            hover_data={'Plattform': False, 'Depression Score': ':.2f', 'Anzahl Nutzer': True,
+                        'KI oben': False, 'KI unten': False}
         )
 
         fig.update_layout(
@@ -246,30 +181,92 @@ with tab5:
     else:
         st.warning("Eine der beiden Apps hat keine Nutzer im gefilterten Datensatz.")
 
+    # --- ALLE PAARE (ein Matrixprodukt statt 36 Einzelvergleiche) ---
+    if st.toggle("Alle App-Paare vergleichen"):
+        paare = plattform_paare(df, filter_state)
+        zwei_stellen = st.column_config.NumberColumn(format="%.2f")
+        st.dataframe(
+            paare, use_container_width=True, hide_index=True,
+            column_config={"Ø 1": zwei_stellen, "Ø 2": zwei_stellen, "Differenz": zwei_stellen, "Ø beide": zwei_stellen}
+        )
+
+
+# --- Kohorten-Vergleich: zwei frei definierte Gruppen über alle Fragen ---
+def kohorte_waehlen(seite, spalte, standard_zeiten):
+    """Widgets für eine Kohorte; leere Auswahl = keine Einschränkung."""
+    tabelle = load_kohorten()
+    with spalte:
+        st.subheader(f"Kohorte {seite}")
+        berufe = st.multiselect("Berufsstatus", tabelle.berufe, key=f"kohorte_{seite}_beruf")
+        zeiten = st.multiselect("Nutzungsdauer", tabelle.zeiten, default=standard_zeiten, key=f"kohorte_{seite}_zeit")
+        lo, hi = int(tabelle.alter.min()), int(tabelle.alter.max())
+        alter = st.slider("Alter", lo, hi, (lo, hi), key=f"kohorte_{seite}_alter")
+        apps = st.multiselect("Plattformen", plattformen.APPS, key=f"kohorte_{seite}_apps")
+        alle = st.toggle("Alle gewählten Plattformen (statt mindestens eine)", key=f"kohorte_{seite}_alle")
+    return Kohorte(tuple(berufe), tuple(zeiten), None if alter == (lo, hi) else alter, tuple(apps), alle)
+
+
+def kohorten_vergleich():
+    st.header("Kohorten-Vergleich")
+    st.markdown("Definiere zwei Gruppen und vergleiche sie über **alle Fragen** gleichzeitig. "
+                "Die Sidebar-Filter gelten hier nicht.")
+
+    c_a, c_b = st.columns(2)
+    a = kohorte_waehlen("A", c_a, ["Wenig"])
+    b = kohorte_waehlen("B", c_b, ["Viel"])
+
+    # Aus den Zellen-Summen: O(Zellen) statt zweimal Maskieren pro Frage
+    ergebnis = ui.kohorten_vergleich(df, a, b)
+    personen_a, personen_b = ergebnis.attrs["personen"]
+    c_a.metric("Personen", personen_a)
+    c_b.metric("Personen", personen_b)
+    if not personen_a or not personen_b:
+        st.warning("Eine der Kohorten ist leer.")
+        return
+
+    # Sidebar-Filter gelten hier nicht -> nur die beiden Kohorten bestimmen das Bild
+    show_figure("fig_kohorten", df, None, diagramme.kohorten_vergleich, ergebnis, bootstrap.ALPHA,
+                variante=(a.key(), b.key()))
+    st.caption("Balken: Differenz B - A mit 95%-Intervall (Welch-t-Test). "
+               "Personen, die zu beiden Kohorten passen, zählen in beiden.")
+
+    zwei_stellen = st.column_config.NumberColumn(format="%.2f")
+    st.dataframe(
+        ergebnis.rename(index=diagramme.rename_map), use_container_width=True,
+        column_config={c: zwei_stellen for c in ["Ø A", "SD A", "Ø B", "SD B", "Differenz", "KI ±", "Cohen's d"]}
+        | {"p": st.column_config.NumberColumn(format="%.3f")},
+    )
+
+
 # --- TAB 3: Korrelations-Analyse (JETZT AM ENDE) ---
-with tab3:
+def korrelationen():
     st.header(" Korrelations-Analyse")
     st.write("Dunkelrot = Starker Zusammenhang")
 
-    numeric_df = df_filtered.select_dtypes(include=['number']).drop(columns=['1. What is your age?'], errors='ignore')
-    rename_map = {
-        '18. How often do you feel depressed or down?': 'Depression',
-        '13. On a scale of 1 to 5, how much are you bothered by worries?': 'Sorgen',
-        '20. On a scale of 1 to 5, how often do you face issues regarding sleep?': 'Schlaf',
-        '15. On a scale of 1-5, how often do you compare yourself to other successful people through the use of social media?': 'Vergleich',
-        '12. On a scale of 1 to 5, how easily distracted are you?': 'Ablenkung (Allgemein)',
-        '17. How often do you look to seek validation from features of social media?': 'Validierung',
-        '9. How often do you find yourself using Social media without a specific purpose?': 'Zwecklose Nutzung',
-        '10. How often do you get distracted by Social media when you are busy doing something?': 'Ablenkung (Arbeit)',
-        '11. Do you feel restless if you haven\'t used Social media in a while?': 'Unruhe',
-        '14. Do you find it difficult to concentrate on things?': 'Konzentration',
-        '19. On a scale of 1 to 5, how frequently does your interest in daily activities fluctuate?': 'Interesse-Schwankung',
-        '16. How do you feel about these comparisons, generally speaking?': 'Gefühl bei Vergleich'
-
-    }
-    numeric_df = numeric_df.rename(columns=rename_map)
-
-    # Heatmap etwas breiter machen
-    fig_corr, ax_corr = plt.subplots(figsize=(10, 6))
-    sns.heatmap(numeric_df.corr(), annot=True, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, ax=ax_corr)
-    st.pyplot(fig_corr, use_container_width=True)
\ No newline at end of file
+    # Die Antworten sind ordinal (1-5) -> Rang-Korrelationen als Alternative zu Pearson
+    c_methode, c_maske = st.columns([2, 1])
+    methode = c_methode.selectbox("Methode", list(korrelation.METHODEN), format_func=korrelation.METHODEN.get)
+    nur_signifikant = c_maske.toggle(f"Nur signifikante (p < {bootstrap.ALPHA:g})", value=True)
+
+    ergebnis = ui.korrelation(df, filter_state, methode)
+    show_figure("fig_corr", df, filter_state, diagramme.korrelation, ergebnis, nur_signifikant, bootstrap.ALPHA,
+                variante=(methode, nur_signifikant))
+    st.caption(f"Paarweise Fallzahlen: {ergebnis.n.to_numpy().min()}–{ergebnis.n.to_numpy().max()}. "
+               "p-Werte ohne Korrektur für multiples Testen.")
+
+
+# --- ANSICHTEN ---
+# Statt st.tabs (führt bei jedem Rerun den Code ALLER Tabs aus) wird nur die gewählte Ansicht gerechnet
+ansichten = {
+    "Haupt-Analyse": haupt_analyse,
+    "Schlaf & Sorgen": schlaf_und_sorgen,
+    "Profil-Vergleich": profil_vergleich,
+    "Plattform-Check": plattform_check,
+    "Kohorten-Vergleich": kohorten_vergleich,
+    "Korrelationen": korrelationen,
+}
+ansicht = st.radio("Ansicht", list(ansichten), horizontal=True, key="vis_ansicht", label_visibility="collapsed")
+with perf.stage(f"ansicht:{ansicht}", rows=len(auswahl)):
+    ansichten[ansicht]()
+
+perf_panel()
@@ -0,0 +1,9 @@
+import pytest
+
+from analyse import daten
+
+
+@pytest.fixture(scope="session")
+def df():
+    """Bereinigter Grunddatensatz, ohne Arrow-Cache und ohne eingespielte Wellen."""
+    return daten.clean(daten.read_raw())
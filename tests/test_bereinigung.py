@@ -0,0 +1,68 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyse import daten, ingest
+from analyse.bereinigung import SchemaFehler, bereinigen
+from analyse.schema import AGE_COL, LIKERT_COLS, USES_SOCIAL_MEDIA_COL
+
+
+def _roh(tmp_path, aendern):
+    """Rohexport aus der CSV (mit Spalte 6), ``aendern(df)`` baut Fehler ein, eingelesen wie ein echter Export."""
+    df = pd.read_csv(daten.DATA_PATH).head(20)
+    df.insert(1, USES_SOCIAL_MEDIA_COL, "Yes")
+    df = df.astype(object)
+    aendern(df)
+    pfad = tmp_path / "export.csv"
+    df.to_csv(pfad, index=False)
+    return pfad
+
+
+def _entfernt(bericht, regel):
+    return int(bericht.set_index("Regel").loc[regel, "Zeilen entfernt"])
+
+
+def test_nicht_numerische_likert_antwort_wird_entfernt_und_gezaehlt(tmp_path):
+    pfad = _roh(tmp_path, lambda df: df.__setitem__(LIKERT_COLS[0], ["k.A."] + list(df[LIKERT_COLS[0]][1:])))
+    df, bericht = bereinigen(daten.read_raw(pfad))
+
+    assert len(df) == 19
+    assert _entfernt(bericht, "Ungültige Likert-Werte") == 1
+    assert df[LIKERT_COLS[0]].dtype == np.int8
+
+
+def test_nicht_numerisches_alter_wird_entfernt_und_gezaehlt(tmp_path):
+    pfad = _roh(tmp_path, lambda df: df.__setitem__(AGE_COL, ["unbekannt"] + list(df[AGE_COL][1:])))
+    df, bericht = bereinigen(daten.read_raw(pfad))
+
+    assert len(df) == 19
+    assert _entfernt(bericht, "Alters-Ausreißer") == 1
+
+
+def test_fehlende_werte_bleiben_erhalten(tmp_path):
+    pfad = _roh(tmp_path, lambda df: df.__setitem__(LIKERT_COLS[0], [None] + list(df[LIKERT_COLS[0]][1:])))
+    df, bericht = bereinigen(daten.read_raw(pfad))
+
+    assert len(df) == 20
+    assert _entfernt(bericht, "Ungültige Likert-Werte") == 0
+    assert df[LIKERT_COLS[0]].isna().sum() == 1
+
+
+def test_fehlende_pflichtspalte(tmp_path):
+    with pytest.raises(SchemaFehler, match="Pflichtspalten fehlen"):
+        bereinigen(daten.read_raw(daten.DATA_PATH).drop(columns=[AGE_COL]))
+
+
+def test_ingest_mit_nicht_numerischer_likert_antwort(tmp_path):
+    pfad = _roh(tmp_path, lambda df: df.__setitem__(LIKERT_COLS[0], ["k.A."] + list(df[LIKERT_COLS[0]][1:])))
+    wellen_dir = tmp_path / "wellen"
+    wellen_dir.mkdir()
+    basis = shutil.copy(daten.DATA_PATH, tmp_path / "basis.csv")
+
+    (eintrag,) = ingest.ingest([pfad], wellen_dir=wellen_dir, basis_path=basis, cache_dir=tmp_path / "cache")
+
+    assert eintrag["zeilen"] == 19
+    assert eintrag["bereinigung"] == {"Ungültige Likert-Werte": 1}
+    assert any((tmp_path / "cache").iterdir())
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from analyse.cube import AggregateCube
+from analyse.schema import AGE_COL, LIKERT_COLS, OCCUPATION_COL, USAGE_COL
+
+
+@pytest.mark.parametrize("berufe, zeiten, alter", [
+    (None, None, None),
+    (["Schüler"], None, None),
+    (["Student (Uni)", "Angestellter"], ["Viel"], (18, 35)),
+    (None, ["Wenig", "Mittel"], (40, 90)),
+])
+def test_query_wie_maske(df, berufe, zeiten, alter):
+    maske = np.ones(len(df), dtype=bool)
+    if berufe:
+        maske &= df[OCCUPATION_COL].isin(berufe)
+    if zeiten:
+        maske &= df[USAGE_COL].isin(zeiten)
+    if alter:
+        maske &= df[AGE_COL].between(*alter)
+    teil = df[maske]
+    werte = teil[[c for c in LIKERT_COLS if c in df.columns]].astype(float)
+
+    ergebnis = AggregateCube(df).query(berufe, zeiten, alter)
+
+    assert ergebnis.rows == len(teil) > 0
+    np.testing.assert_array_equal(ergebnis.counts, werte.count().to_numpy())
+    np.testing.assert_allclose(ergebnis.mean().to_numpy(), werte.mean().to_numpy())
+    np.testing.assert_allclose(ergebnis.std().to_numpy(), werte.std().to_numpy())
+    assert ergebnis.mean_age() == pytest.approx(teil[AGE_COL].mean())
+    beschreibung = ergebnis.describe()
+    for col in [AGE_COL, *werte.columns]:
+        np.testing.assert_allclose(beschreibung[col].to_numpy(dtype=float),
+                                   teil[col].astype(float).describe().to_numpy())
+
+
+def test_leere_auswahl(df):
+    ergebnis = AggregateCube(df).query(zeiten=["Viel"], age_range=(95, 99))
+    assert ergebnis.rows == 0
+    assert ergebnis.hist.sum() == 0
+
+
+def test_erweitert_wie_neu_aufgebaut(df):
+    erweitert = AggregateCube(df.iloc[:250]).erweitert(df.iloc[250:])
+    neu = AggregateCube(df)
+    a, b = erweitert.query(["Schüler", "Rentner"], None, (12, 70)), neu.query(["Schüler", "Rentner"], None, (12, 70))
+    assert a.rows == b.rows
+    np.testing.assert_array_equal(a.hist, b.hist)
+    np.testing.assert_allclose(a.describe(), b.describe())
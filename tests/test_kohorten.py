@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from analyse import plattformen
+from analyse.abfrage import Abfragen
+from analyse.kohorten import GruppenTabelle, Kohorte, vergleich
+from analyse.schema import AGE_COL, LIKERT_COLS, OCCUPATION_COL, USAGE_COL
+from analyse.statistik import t_quantil
+
+
+def _werte(df):
+    return df[[c for c in LIKERT_COLS if c in df.columns]].astype(float)
+
+
+def test_zellen_wie_groupby(df):
+    tabelle = GruppenTabelle(df)
+    for (beruf, zeit), teil in _werte(df).groupby([df[OCCUPATION_COL], df[USAGE_COL]], observed=True):
+        personen, n, summe, quadratsumme = tabelle.statistik(Kohorte(berufe=(beruf,), zeiten=(zeit,)))
+        assert personen == len(teil)
+        np.testing.assert_array_equal(n, teil.count().to_numpy())
+        np.testing.assert_allclose(summe, teil.sum().to_numpy())
+        np.testing.assert_allclose(quadratsumme, (teil ** 2).sum().to_numpy())
+
+
+@pytest.mark.parametrize("alle_apps", [False, True])
+def test_alter_und_apps_wie_maske(df, alle_apps):
+    kohorte = Kohorte(zeiten=("Viel",), alter=(18, 30), apps=("Instagram", "YouTube"), alle_apps=alle_apps)
+    apps = plattformen.platform_matrix(df)[list(kohorte.apps)]
+    maske = ((df[USAGE_COL] == "Viel") & df[AGE_COL].between(18, 30)
+             & (apps.all(axis=1) if alle_apps else apps.any(axis=1)))
+    teil = _werte(df)[maske]
+
+    personen, n, summe, _ = GruppenTabelle(df).statistik(kohorte)
+
+    assert personen == int(maske.sum()) > 0
+    np.testing.assert_array_equal(n, teil.count().to_numpy())
+    np.testing.assert_allclose(summe, teil.sum().to_numpy())
+
+
+def test_erweitert_wie_neu_aufgebaut(df):
+    erweitert = GruppenTabelle(df.iloc[:300]).erweitert(df.iloc[300:])
+    neu = GruppenTabelle(df)
+    kohorte = Kohorte(berufe=("Student (Uni)",), alter=(20, 25))
+    for a, b in zip(erweitert.statistik(kohorte), neu.statistik(kohorte)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_vergleich_welch(df):
+    a, b = Kohorte(zeiten=("Wenig",)), Kohorte(zeiten=("Viel",))
+    ergebnis = vergleich(GruppenTabelle(df), a, b)
+
+    col = ergebnis.index[0]
+    x = df.loc[df[USAGE_COL] == "Wenig", col].astype(float)
+    y = df.loc[df[USAGE_COL] == "Viel", col].astype(float)
+    var_x, var_y = x.var() / len(x), y.var() / len(y)
+    freiheitsgrade = (var_x + var_y) ** 2 / (var_x ** 2 / (len(x) - 1) + var_y ** 2 / (len(y) - 1))
+    zeile = ergebnis.loc[col]
+    assert zeile["Differenz"] == pytest.approx(y.mean() - x.mean())
+    assert zeile["SD A"] == pytest.approx(x.std())
+    assert zeile["KI ±"] == pytest.approx(t_quantil(0.975, freiheitsgrade) * np.sqrt(var_x + var_y))
+
+
+@pytest.mark.parametrize("df_wert, q, erwartet", [(1, 0.975, 12.7062), (5, 0.975, 2.5706), (30, 0.975, 2.0423),
+                                                  (10, 0.995, 3.1693)])
+def test_t_quantil(df_wert, q, erwartet):
+    assert t_quantil(q, df_wert) == pytest.approx(erwartet, abs=1e-4)
+
+
+@pytest.mark.parametrize("angaben", [
+    {"berufe": "Schüler"}, {"zeiten": ["Nobody"]}, {"alter": [18]}, {"alter": [18.7, 25]},
+    {"alter": [5, 25]}, {"apps": "TikTok"}, {"alle_apps": "ja"}, {"farbe": "blau"},
+])
+def test_kohorte_ungueltige_angaben(df, angaben):
+    with pytest.raises(ValueError):
+        Abfragen(df).kohorte(angaben)
+
+
+def test_kohorte_gueltige_angaben(df):
+    kohorte = Abfragen(df).kohorte({"berufe": ["Schüler"], "alter": [13, 20], "apps": ["TikTok"]})
+    assert kohorte == Kohorte(("Schüler",), (), (13, 20), ("TikTok",), False)
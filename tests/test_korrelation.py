@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from analyse.korrelation import METHODEN, korrelation
+from analyse.schema import LIKERT_COLS
+
+
+@pytest.fixture(scope="module")
+def mit_luecken(df):
+    """Grunddaten mit einzelnen fehlenden Antworten, damit paarweise ausgelassen wird."""
+    df = df.copy()
+    rng = np.random.default_rng(0)
+    for col in [c for c in LIKERT_COLS if c in df.columns][:4]:
+        df[col] = df[col].astype("Float64")
+        df.loc[df.index[rng.random(len(df)) < 0.1], col] = None
+    return df
+
+
+def _kendall_paarweise(x, y):
+    """τ-b direkt über alle Personenpaare; pandas bräuchte dafür scipy."""
+    gueltig = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[gueltig], y[gueltig]
+    dx, dy = np.sign(x[:, None] - x[None, :]), np.sign(y[:, None] - y[None, :])
+    return (dx * dy).sum() / math.sqrt((dx != 0).sum() * (dy != 0).sum())
+
+
+@pytest.mark.parametrize("methode", list(METHODEN))
+def test_r_wie_pandas(mit_luecken, methode):
+    ergebnis = korrelation(mit_luecken, methode)
+    werte = mit_luecken[list(ergebnis.r.columns)].astype(float)
+
+    if methode == "kendall":
+        spalten = werte.to_numpy().T
+        erwartet = np.array([[_kendall_paarweise(x, y) for y in spalten] for x in spalten])
+    else:
+        erwartet = werte.corr(method=methode).to_numpy()
+    np.testing.assert_allclose(ergebnis.r.to_numpy(), erwartet, atol=1e-12)
+    vorhanden = werte.notna().to_numpy(dtype=np.int64)
+    np.testing.assert_array_equal(ergebnis.n.to_numpy(), vorhanden.T @ vorhanden)
+
+    p = ergebnis.p.to_numpy()
+    assert np.all((p >= 0) & (p <= 1))
+    assert np.all(np.diag(p) == 0)
+
+
+def test_pearson_p_fisher(mit_luecken):
+    ergebnis = korrelation(mit_luecken, "pearson")
+    a, b = ergebnis.r.columns[:2]
+    r, n = ergebnis.r.loc[a, b], ergebnis.n.loc[a, b]
+    erwartet = math.erfc(abs(math.atanh(r)) * math.sqrt(n - 3) / math.sqrt(2))
+    assert ergebnis.p.loc[a, b] == pytest.approx(erwartet)
+
+
+def test_unbekannte_methode(df):
+    with pytest.raises(ValueError):
+        korrelation(df, "cosinus")